@@ -2,7 +2,7 @@ import numpy as np
 from statistics import mean
 from collections import Counter
 import matplotlib.pyplot as plt
-import hashlib
+from backend.result_cache import ResultCache
 
 class AlgorithmEfficiencyAnalyzer:
     """
@@ -11,9 +11,15 @@ class AlgorithmEfficiencyAnalyzer:
     la generazione di grafici di distribuzione e la valutazione complessiva degli algoritmi.
     """
 
+    # Algoritmi eseguiti su ogni istanza: gli altri mancano nelle istanze salvate prima della loro introduzione,
+    # l'FFT viene saltata quando il target supera il limite di memoria del generatore e la Programmazione Dinamica
+    # può essere stata eseguita nella versione parallela
+    CORE_ALGORITHMS = ['Meet In The Middle', 'Backtracking']
+
     def __init__(self, db_handler):
         self.db_handler = db_handler
-        self.algorithm_names = ['Dynamic Programming', 'Meet In The Middle', 'Backtracking']
+        self.algorithm_names = ['Dynamic Programming', 'Parallel Dynamic Programming', 'Meet In The Middle', 'Backtracking',
+                                'Schroeppel Shamir', 'FFT Sumset']
 
     def calculate_avg_execution_time(self):
         """
@@ -88,9 +94,18 @@ class AlgorithmEfficiencyAnalyzer:
 
         return variance_std_dense, variance_std_sparse
 
+    @staticmethod
+    def get_instance_id(instance):
+        """
+        Restituisce un identificativo canonico dell'istanza, calcolato come md5 del set ordinato e del target.
+        """
+        return ResultCache.get_instance_id(instance['set'], instance['target_sum'])
+
     def count_fastest_algorithm(self):
         """
         Conta la frequenza con cui ciascun algoritmo è il più veloce per ciascuna istanza, sia densa che sparsa.
+        Vengono considerate le istanze su cui sono stati eseguiti almeno gli algoritmi di CORE_ALGORITHMS, e il più veloce
+        è scelto tra tutti gli algoritmi eseguiti sull'istanza.
         """
         dense_instances = self.db_handler.get_instances_by_type('dense')
         sparse_instances = self.db_handler.get_instances_by_type('sparse')
@@ -98,15 +113,8 @@ class AlgorithmEfficiencyAnalyzer:
         dense_times_per_instance = {}
         sparse_times_per_instance = {}
 
-        def get_instance_id(instance):
-            S = instance['set']
-            T = instance['target_sum']
-            S_tuple = tuple(sorted(S))
-            unique_str = str(S_tuple) + '_' + str(T)
-            return hashlib.md5(unique_str.encode()).hexdigest()
-
         for instance in dense_instances:
-            instance_id = get_instance_id(instance)
+            instance_id = self.get_instance_id(instance)
             algo = instance.get('algorithm')
             exec_time = instance.get('execution_time')
             if algo in self.algorithm_names and exec_time is not None:
@@ -115,7 +123,7 @@ class AlgorithmEfficiencyAnalyzer:
                 dense_times_per_instance[instance_id][algo] = exec_time
 
         for instance in sparse_instances:
-            instance_id = get_instance_id(instance)
+            instance_id = self.get_instance_id(instance)
             algo = instance.get('algorithm')
             exec_time = instance.get('execution_time')
             if algo in self.algorithm_names and exec_time is not None:
@@ -127,12 +135,12 @@ class AlgorithmEfficiencyAnalyzer:
         sparse_fastest = []
 
         for times in dense_times_per_instance.values():
-            if times and len(times) == len(self.algorithm_names):
+            if all(algo in times for algo in self.CORE_ALGORITHMS):
                 fastest_algo = min(times, key=times.get)
                 dense_fastest.append(fastest_algo)
 
         for times in sparse_times_per_instance.values():
-            if times and len(times) == len(self.algorithm_names):
+            if all(algo in times for algo in self.CORE_ALGORITHMS):
                 fastest_algo = min(times, key=times.get)
                 sparse_fastest.append(fastest_algo)
 
@@ -141,6 +149,21 @@ class AlgorithmEfficiencyAnalyzer:
 
         return dense_count, sparse_count
 
+    def calculate_avg_solution_count(self):
+        """
+        Calcola il numero medio di sottoinsiemi che raggiungono il target per le istanze dense e sparse.
+        Ogni istanza viene considerata una sola volta, anche se è stata salvata per più algoritmi.
+        """
+        averages = []
+        for instance_type in ('dense', 'sparse'):
+            counts = {}
+            for instance in self.db_handler.get_instances_by_type(instance_type):
+                solution_count = instance.get('solution_count')
+                if solution_count is not None:
+                    counts[self.get_instance_id(instance)] = int(solution_count)
+            averages.append(mean(counts.values()) if counts else None)
+        return tuple(averages)
+
     def plot_execution_time_distribution(self):
         """
         Genera grafici di distribuzione dei tempi di esecuzione per ciascun algoritmo su istanze dense e sparse.
@@ -164,7 +187,7 @@ class AlgorithmEfficiencyAnalyzer:
                 sparse_times[algo].append(exec_time)
 
         graphs = []
-        fig, axs = plt.subplots(2, 3, figsize=(15, 10))
+        fig, axs = plt.subplots(2, len(self.algorithm_names), figsize=(5 * len(self.algorithm_names), 10))
         fig.suptitle("Distribuzione dei Tempi di Esecuzione per Algoritmo e Tipo di Istanze")
 
         for i, (algo, times) in enumerate(dense_times.items()):
@@ -0,0 +1,201 @@
+import math
+import numpy as np
+
+class AlgorithmSelector:
+    """
+    Questa classe sceglie l'algoritmo da utilizzare per un'istanza del subset sum sulla base dello storico delle esecuzioni
+    salvate nel database. Per ciascun algoritmo viene stimato un modello di costo lineare sul logaritmo del tempo di esecuzione,
+    a partire da caratteristiche dell'istanza economiche da calcolare (n, T, elemento massimo, densità, rapporto T/somma).
+    Il modello è aggiornato in modo incrementale accumulando le equazioni normali, per cui ogni nuova esecuzione può essere
+    aggiunta senza rielaborare lo storico.
+    """
+
+    ALGORITHMS = ['Dynamic Programming', 'Meet In The Middle', 'Backtracking']
+    # Selettore condiviso dalle risoluzioni in modalità automatica, creato alla prima richiesta da get_shared
+    shared_selector = None
+    # Origine dei documenti usati per l'addestramento: solo le campagne dei generatori, non le esecuzioni didattiche della GUI
+    TRAINING_SOURCE = 'generator'
+    # Attesa massima del database in millisecondi durante l'addestramento del selettore condiviso
+    DB_TIMEOUT_MS = 1000
+
+    def __init__(self, max_dp_target=10 ** 7, max_mitm_size=50, min_samples=10, regularization=1e-3):
+        """
+        Inizializza i modelli di costo vuoti per ciascun algoritmo.
+
+        :param max_dp_target: Target massimo oltre il quale la Programmazione Dinamica non viene mai scelta.
+        :param max_mitm_size: Dimensione massima del set oltre la quale il Meet-in-the-Middle non viene mai scelto.
+        :param min_samples: Numero minimo di esecuzioni storiche per usare il modello invece della stima teorica.
+        :param regularization: Coefficiente di regolarizzazione della regressione.
+        """
+        self.max_dp_target = max_dp_target
+        self.max_mitm_size = max_mitm_size
+        self.min_samples = min_samples
+        self.regularization = regularization
+        size = len(self.extract_features([1], 1))
+        self.xtx = {algo: np.zeros((size, size)) for algo in self.ALGORITHMS}
+        self.xty = {algo: np.zeros(size) for algo in self.ALGORITHMS}
+        self.samples = {algo: 0 for algo in self.ALGORITHMS}
+        self.coefficients = {}
+
+    @classmethod
+    def from_db_handlers(cls, *db_handlers, **kwargs):
+        """
+        Crea un selettore addestrato sulle esecuzioni delle campagne dei generatori presenti nei database indicati.
+
+        :param db_handlers: Gestori del database (MongoDBHandler o DenseSparseDBHandler) da cui leggere lo storico.
+        :return: Istanza di AlgorithmSelector addestrata.
+        """
+        selector = cls(**kwargs)
+        for db_handler in db_handlers:
+            selector.fit(db_handler.get_entries_by_source(cls.TRAINING_SOURCE))
+        return selector
+
+    @classmethod
+    def get_shared(cls):
+        """
+        Restituisce il selettore condiviso da tutte le risoluzioni in modalità automatica del processo, addestrato alla
+        prima richiesta sullo storico di entrambi i database: gli aggiornamenti di ogni risoluzione restano così disponibili
+        per quelle successive. Se lo storico non può essere letto entro DB_TIMEOUT_MS il selettore parte vuoto e usa le
+        stime teoriche.
+
+        :return: Istanza condivisa di AlgorithmSelector.
+        """
+        if cls.shared_selector is None:
+            # Import locali: il selettore non richiede il database quando viene creato e passato esplicitamente ai solver
+            from pymongo import errors
+            from backend.mongo_DB_handler import MongoDBHandler
+            from backend.dense_sparse_DB_handler import DenseSparseDBHandler
+            db_handlers = [MongoDBHandler(server_selection_timeout_ms=cls.DB_TIMEOUT_MS),
+                           DenseSparseDBHandler(server_selection_timeout_ms=cls.DB_TIMEOUT_MS)]
+            try:
+                cls.shared_selector = cls.from_db_handlers(*db_handlers)
+            except errors.PyMongoError as e:
+                print(f"Errore durante la lettura dello storico delle esecuzioni: {e}")
+                cls.shared_selector = cls()
+            finally:
+                for db_handler in db_handlers:
+                    db_handler.close()
+        return cls.shared_selector
+
+    @classmethod
+    def update_shared(cls, entries):
+        """
+        Aggiunge al selettore condiviso, se già creato in questo processo, i documenti appena salvati da una campagna.
+        Altrimenti non fa nulla: il selettore li leggerà dal database alla prima richiesta.
+
+        :param entries: Documenti costruiti con build_document.
+        """
+        if cls.shared_selector is not None:
+            cls.shared_selector.fit(entries)
+
+    @staticmethod
+    def normalize_algorithm_name(name):
+        """
+        Uniforma i nomi degli algoritmi salvati dalla GUI e dai generatori (es. 'Meet-in-the-Middle' e 'Meet In The Middle').
+
+        :param name: Nome dell'algoritmo come salvato nel database.
+        :return: Nome normalizzato.
+        """
+        return name.replace('-', ' ').title() if name else name
+
+    @staticmethod
+    def extract_features(S, T):
+        """
+        Calcola il vettore delle caratteristiche di un'istanza: termine costante, log n, n, log T, log dell'elemento massimo,
+        densità n / log2(max(S)) e rapporto tra T e la somma del set.
+
+        :param S: Lista di numeri interi che rappresentano il set.
+        :param T: Somma target da raggiungere.
+        :return: Vettore NumPy delle caratteristiche.
+        """
+        n = len(S)
+        max_element = max(S) if S else 0
+        total = sum(S)
+        log_max = math.log2(max_element + 1)
+        density = n / log_max if log_max > 0 else 0.0
+        ratio = T / total if total > 0 else 0.0
+        return np.array([
+            1.0,
+            math.log2(n + 1),
+            float(n),
+            math.log2(max(T, 0) + 1),
+            log_max,
+            density,
+            ratio,
+        ])
+
+    def fit(self, entries):
+        """
+        Aggiunge al modello un insieme di documenti storici con i campi 'set', 'target_sum', 'algorithm' e 'execution_time'.
+
+        :param entries: Documenti recuperati dal database.
+        """
+        for entry in entries:
+            S = entry.get('set')
+            T = entry.get('target_sum')
+            execution_time = entry.get('execution_time')
+            if S is None or T is None or execution_time is None or entry.get('is_partial'):
+                continue
+            self.update(S, T, entry.get('algorithm'), execution_time)
+
+    def update(self, S, T, algorithm, execution_time):
+        """
+        Aggiorna in modo incrementale il modello di costo di un algoritmo con una nuova esecuzione.
+
+        :param S: Set dell'istanza risolta.
+        :param T: Target dell'istanza risolta.
+        :param algorithm: Nome dell'algoritmo utilizzato.
+        :param execution_time: Tempo di esecuzione misurato.
+        """
+        algorithm = self.normalize_algorithm_name(algorithm)
+        if algorithm not in self.xtx:
+            return
+        x = self.extract_features(S, T)
+        y = math.log(max(float(execution_time), 1e-9))
+        self.xtx[algorithm] += np.outer(x, x)
+        self.xty[algorithm] += x * y
+        self.samples[algorithm] += 1
+        self.coefficients.pop(algorithm, None)
+
+    def predict_log_time(self, algorithm, features):
+        """
+        Stima il logaritmo del tempo di esecuzione di un algoritmo. Se lo storico non è sufficiente viene usata una stima
+        teorica della complessità (n·T per la Programmazione Dinamica, 2^(n/2) per il Meet-in-the-Middle, 2^n per il Backtracking).
+
+        :param algorithm: Nome dell'algoritmo.
+        :param features: Vettore delle caratteristiche dell'istanza.
+        :return: Logaritmo naturale del tempo stimato.
+        """
+        if self.samples[algorithm] >= self.min_samples:
+            if algorithm not in self.coefficients:
+                matrix = self.xtx[algorithm] + self.regularization * np.eye(len(features))
+                self.coefficients[algorithm] = np.linalg.solve(matrix, self.xty[algorithm])
+            return float(features @ self.coefficients[algorithm])
+
+        log2_n, n, log2_t = features[1], features[2], features[3]
+        if algorithm == 'Dynamic Programming':
+            operations = log2_n + log2_t
+        elif algorithm == 'Meet In The Middle':
+            operations = n / 2 + math.log2(n / 2 + 1)
+        else:
+            operations = n
+        return operations * math.log(2)
+
+    def select(self, S, T):
+        """
+        Sceglie l'algoritmo con il minor tempo stimato tra quelli ammissibili per l'istanza.
+        La Programmazione Dinamica viene esclusa per target troppo grandi e il Meet-in-the-Middle per set troppo grandi.
+
+        :param S: Lista di numeri interi che rappresentano il set.
+        :param T: Somma target da raggiungere.
+        :return: Nome dell'algoritmo scelto.
+        """
+        features = self.extract_features(S, T)
+        candidates = []
+        for algorithm in self.ALGORITHMS:
+            if algorithm == 'Dynamic Programming' and T > self.max_dp_target:
+                continue
+            if algorithm == 'Meet In The Middle' and len(S) > self.max_mitm_size:
+                continue
+            candidates.append((self.predict_log_time(algorithm, features), algorithm))
+        return min(candidates)[1]
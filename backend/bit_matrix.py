@@ -0,0 +1,167 @@
+class BitMatrix:
+    """
+    Questa classe memorizza una matrice booleana (ad esempio la matrice dp della Programmazione Dinamica) con un bit per
+    cella: ogni riga è un bytearray di (colonne + 7) // 8 byte, invece di una lista di bool Python (8 byte per cella più
+    l'overhead della lista). L'accesso mantiene la semantica dp[i][t]: dp[i] restituisce una vista della riga che non copia
+    i dati, e column(t) una vista della colonna; le celle vengono decodificate solo quando vengono lette.
+    """
+
+    def __init__(self, rows, columns):
+        """
+        Crea una matrice con tutte le celle a False.
+
+        :param rows: Numero di righe.
+        :param columns: Numero di colonne.
+        """
+        self.rows = rows
+        self.columns = columns
+        self.row_bytes = (columns + 7) // 8
+        self.data = [bytearray(self.row_bytes) for _ in range(rows)]
+
+    def get(self, i, t):
+        """
+        Restituisce il valore di una cella.
+
+        :param i: Indice di riga.
+        :param t: Indice di colonna.
+        :return: True se il bit della cella è impostato, altrimenti False.
+        """
+        if not 0 <= t < self.columns:
+            raise IndexError("indice di colonna fuori intervallo")
+        return bool((self.data[i][t >> 3] >> (t & 7)) & 1)
+
+    def set(self, i, t, value=True):
+        """
+        Imposta il valore di una cella.
+
+        :param i: Indice di riga.
+        :param t: Indice di colonna.
+        :param value: Valore da assegnare.
+        """
+        if not 0 <= t < self.columns:
+            raise IndexError("indice di colonna fuori intervallo")
+        if value:
+            self.data[i][t >> 3] |= 1 << (t & 7)
+        else:
+            self.data[i][t >> 3] &= ~(1 << (t & 7)) & 0xFF
+
+    def get_row_bits(self, i):
+        """
+        Restituisce una riga come intero, il cui bit t è la cella (i, t).
+
+        :param i: Indice di riga.
+        :return: Intero con i bit della riga.
+        """
+        return int.from_bytes(self.data[i], 'little')
+
+    def set_row_bits(self, i, bits):
+        """
+        Sostituisce una riga con i bit di un intero; i bit oltre l'ultima colonna vengono ignorati.
+
+        :param i: Indice di riga.
+        :param bits: Intero il cui bit t è il nuovo valore della cella (i, t).
+        """
+        bits &= (1 << self.columns) - 1
+        self.data[i] = bytearray(bits.to_bytes(self.row_bytes, 'little'))
+
+    def row(self, i):
+        """
+        Restituisce una vista della riga i, senza copiarne i dati.
+
+        :param i: Indice di riga.
+        :return: Istanza di BitMatrixView.
+        """
+        if i < 0:
+            i += self.rows
+        if not 0 <= i < self.rows:
+            raise IndexError("indice di riga fuori intervallo")
+        return BitMatrixView(self.columns, lambda t: self.get(i, t))
+
+    def column(self, t):
+        """
+        Restituisce una vista della colonna t, senza copiarne i dati.
+
+        :param t: Indice di colonna.
+        :return: Istanza di BitMatrixView.
+        """
+        if t < 0:
+            t += self.columns
+        if not 0 <= t < self.columns:
+            raise IndexError("indice di colonna fuori intervallo")
+        return BitMatrixView(self.rows, lambda i: self.get(i, t))
+
+    def nbytes(self):
+        """
+        Restituisce la memoria occupata dai dati della matrice, in byte.
+        """
+        return self.rows * self.row_bytes
+
+    def __getitem__(self, index):
+        """
+        Accesso con la stessa semantica di una lista di liste: dp[i] è la vista della riga i, dp[i, t] la singola cella.
+
+        :param index: Indice di riga oppure tupla (riga, colonna).
+        :return: Vista della riga o valore della cella.
+        """
+        if isinstance(index, tuple):
+            i, t = index
+            return self.get(i, t)
+        return self.row(index)
+
+    def __len__(self):
+        """
+        Numero di righe della matrice.
+        """
+        return self.rows
+
+    def __iter__(self):
+        """
+        Itera sulle viste delle righe.
+        """
+        for i in range(self.rows):
+            yield self.row(i)
+
+
+class BitMatrixView:
+    """
+    Vista in sola lettura di una riga o di una colonna di una BitMatrix: si comporta come una sequenza di bool,
+    decodificando le celle solo quando vengono lette.
+    """
+
+    def __init__(self, length, getter):
+        """
+        Inizializza la vista.
+
+        :param length: Numero di celle della vista.
+        :param getter: Funzione che restituisce il valore della cella di indice dato.
+        """
+        self.length = length
+        self.getter = getter
+
+    def __getitem__(self, index):
+        """
+        Restituisce una cella o, per una slice, la lista delle celle dell'intervallo.
+
+        :param index: Indice intero o slice.
+        :return: Valore della cella o lista di valori.
+        """
+        if isinstance(index, slice):
+            return [self.getter(k) for k in range(*index.indices(self.length))]
+        if index < 0:
+            index += self.length
+        if not 0 <= index < self.length:
+            raise IndexError("indice fuori intervallo")
+        return self.getter(index)
+
+    def __len__(self):
+        """
+        Numero di celle della vista.
+        """
+        return self.length
+
+    def __iter__(self):
+        """
+        Itera sulle celle della vista.
+        """
+        for k in range(self.length):
+            yield self.getter(k)
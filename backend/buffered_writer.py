@@ -0,0 +1,108 @@
+from time import perf_counter
+
+class BufferedWriter:
+    """
+    Questa classe accumula i documenti da salvare in una collezione MongoDB e li scrive a blocchi con un'unica
+    insert_many(ordered=False), invece di una richiesta per documento. Il blocco viene scritto quando raggiunge batch_size
+    documenti oppure quando il documento più vecchio attende da più di flush_interval secondi (il controllo avviene a ogni
+    aggiunta), e in ogni caso alla chiusura. Tiene inoltre i contatori della latenza delle scritture e della dimensione
+    dei blocchi.
+    """
+
+    def __init__(self, collection, batch_size=500, flush_interval=1.0):
+        """
+        Inizializza il buffer.
+
+        :param collection: Collezione MongoDB in cui scrivere.
+        :param batch_size: Numero di documenti che provoca la scrittura del blocco.
+        :param flush_interval: Attesa massima in secondi del documento più vecchio prima della scrittura.
+        """
+        self.collection = collection
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self.buffer = []
+        self.oldest_time = None
+        self.flushes = 0
+        self.failed_flushes = 0
+        self.documents_written = 0
+        self.total_write_time = 0.0
+        self.max_write_time = 0.0
+        self.max_batch_size = 0
+
+    def add(self, document):
+        """
+        Aggiunge un documento al buffer, scrivendo il blocco se è stata superata una delle soglie.
+
+        :param document: Documento da salvare.
+        """
+        self.extend([document])
+
+    def extend(self, documents):
+        """
+        Aggiunge più documenti al buffer, scrivendo il blocco se è stata superata una delle soglie.
+
+        :param documents: Lista di documenti da salvare.
+        """
+        if not documents:
+            return
+        if self.oldest_time is None:
+            self.oldest_time = perf_counter()
+        self.buffer.extend(documents)
+        if len(self.buffer) >= self.batch_size or perf_counter() - self.oldest_time >= self.flush_interval:
+            self.flush()
+
+    def flush(self):
+        """
+        Scrive tutti i documenti del buffer. Il buffer viene svuotato anche se la scrittura fallisce, così che un errore
+        non venga ripetuto a ogni scrittura successiva; con ordered=False i documenti validi del blocco vengono comunque
+        salvati e, se l'errore ne riporta il numero (BulkWriteError), sono contati tra quelli scritti.
+
+        :raises pymongo.errors.PyMongoError: Se la scrittura fallisce.
+        """
+        if not self.buffer:
+            return
+        batch, self.buffer, self.oldest_time = self.buffer, [], None
+        start_time = perf_counter()
+        try:
+            self.collection.insert_many(batch, ordered=False)
+        except Exception as e:
+            self.failed_flushes += 1
+            # I dettagli di BulkWriteError riportano i documenti inseriti prima e dopo quelli rifiutati
+            details = getattr(e, 'details', None)
+            if isinstance(details, dict):
+                self.documents_written += details.get('nInserted', 0)
+            raise
+        else:
+            self.documents_written += len(batch)
+        finally:
+            write_time = perf_counter() - start_time
+            self.flushes += 1
+            self.total_write_time += write_time
+            self.max_write_time = max(self.max_write_time, write_time)
+            self.max_batch_size = max(self.max_batch_size, len(batch))
+
+    def close(self):
+        """
+        Scrive i documenti rimasti nel buffer.
+        """
+        self.flush()
+
+    def stats(self):
+        """
+        Restituisce i contatori delle scritture.
+
+        :return: Dizionario con numero di scritture (e di quelle fallite), documenti scritti, documenti in attesa,
+                 dimensione media e massima dei blocchi, latenza totale, media e massima delle scritture in secondi.
+        """
+        successful_flushes = self.flushes - self.failed_flushes
+        return {
+            'flushes': self.flushes,
+            'failed_flushes': self.failed_flushes,
+            'documents_written': self.documents_written,
+            'pending': len(self.buffer),
+            'avg_batch_size': self.documents_written / successful_flushes if successful_flushes else 0.0,
+            'max_batch_size': self.max_batch_size,
+            'total_write_time': self.total_write_time,
+            'avg_write_time': self.total_write_time / self.flushes if self.flushes else 0.0,
+            'max_write_time': self.max_write_time,
+        }
@@ -0,0 +1,175 @@
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import numpy as np
+from backend.subset_sum_calculator_for_analysis import SubsetSumSolver
+from backend.algorithm_selector import AlgorithmSelector
+from backend.result_cache import ResultCache
+
+class CampaignGenerator:
+    """
+    Questa classe raccoglie la logica comune ai generatori di istanze: derivazione dei seed delle istanze dal seed della
+    campagna, conteggio delle soluzioni, esecuzione degli algoritmi attraverso la cache dei risultati ed esecuzione della
+    campagna, seriale o in parallelo su più processi, con il salvataggio a blocchi dei documenti nel database.
+    Le sottoclassi definiscono get_instance_tasks e solve_instance.
+    """
+
+    # Target ridotto massimo per cui viene calcolato il numero di soluzioni
+    COUNT_TARGET_LIMIT = 10 ** 5
+    # Documenti accumulati prima di ogni scrittura nel database
+    BATCH_SIZE = 500
+
+    def __init__(self, db_handler, seed=None, deadline=None, epsilon=None, result_cache=None, campaign_workers=None,
+                 exact_counts=False):
+        """
+        Inizializza i parametri comuni della campagna.
+
+        :param db_handler: Gestore del database in cui vengono salvati i documenti.
+        :param seed: Seed della campagna, da cui viene derivato il seed di ciascuna istanza.
+        :param deadline: Budget di tempo in secondi per ciascun algoritmo (opzionale).
+        :param epsilon: Se indicato, esegue anche l'algoritmo approssimato FPTAS con questo errore relativo.
+        :param result_cache: ResultCache con i risultati delle istanze già risolte, che non vengono rieseguite né salvate
+                             di nuovo nel database (opzionale, usata solo nell'esecuzione seriale).
+        :param campaign_workers: Se indicato, le istanze vengono risolte in parallelo su questo numero di processi.
+        :param exact_counts: Se True il numero di soluzioni è calcolato con interi a precisione arbitraria per ogni
+                             istanza; altrimenti con il conteggio modulare, molto più veloce, e solo quando coincide con
+                             quello esatto. In entrambi i casi il conteggio rispetta la deadline.
+        """
+        self.db_handler = db_handler
+        self.seed = seed
+        self.deadline = deadline
+        self.epsilon = epsilon
+        self.result_cache = result_cache
+        self.campaign_workers = campaign_workers
+        self.exact_counts = exact_counts
+        # Con seed None l'entropia viene scelta dal sistema e resta disponibile in seed_sequence.entropy
+        self.seed_sequence = np.random.SeedSequence(seed)
+
+    def __getstate__(self):
+        """
+        Stato inviato ai processi di una campagna parallela: la connessione al database e la cache restano nel processo
+        principale, che si occupa di tutte le scritture.
+        """
+        state = self.__dict__.copy()
+        state['db_handler'] = None
+        state['result_cache'] = None
+        return state
+
+    def spawn_instance_seeds(self, count):
+        """
+        Deriva dal seed della campagna un seed indipendente per ciascuna istanza: l'istanza i è la stessa qualunque sia
+        l'ordine o il processo in cui viene risolta.
+
+        :param count: Numero di seed da generare.
+        :return: Lista dei seed delle istanze.
+        """
+        # Si riparte dall'entropia della campagna perché spawn fa avanzare la sequenza su cui viene chiamato
+        sequence = np.random.SeedSequence(self.seed_sequence.entropy)
+        return [int(child.generate_state(1)[0]) for child in sequence.spawn(count)]
+
+    def get_instance_tasks(self):
+        """
+        Elenca le istanze della campagna.
+
+        :return: Lista di coppie (argomenti di solve_instance, messaggio di avanzamento).
+        """
+        raise NotImplementedError
+
+    def solve_instance(self, *args):
+        """
+        Genera un'istanza, esegue tutti gli algoritmi e restituisce i documenti da salvare.
+
+        :return: Lista dei documenti, uno per algoritmo.
+        """
+        raise NotImplementedError
+
+    def count_instance_solutions(self, solver):
+        """
+        Conta i sottoinsiemi dell'istanza del solver che sommano al target, se il target ridotto non supera
+        COUNT_TARGET_LIMIT e il conteggio termina entro la deadline.
+
+        :param solver: Istanza di SubsetSumSolver (versione di analisi).
+        :return: Numero di soluzioni, oppure None se non è stato calcolato.
+        """
+        if solver.T > self.COUNT_TARGET_LIMIT:
+            return None
+        if self.exact_counts:
+            return solver.count_solutions(deadline=self.deadline)
+        # Le soluzioni sono al più 2^n: finché 2^n non supera il modulo il conteggio modulare coincide con quello esatto
+        if 2 ** len(solver.original_S) <= SubsetSumSolver.COUNT_MODULUS:
+            return solver.count_solutions(SubsetSumSolver.COUNT_MODULUS, deadline=self.deadline)
+        return None
+
+    def run_algorithm(self, solver, algorithm_name, algorithm_method):
+        """
+        Esegue un algoritmo sull'istanza del solver, attraverso la cache dei risultati se presente.
+
+        :param solver: Istanza di SubsetSumSolver (versione di analisi).
+        :param algorithm_name: Nome dell'algoritmo salvato nel database.
+        :param algorithm_method: Metodo calculate_* legato al solver.
+        :return: Dizionario del risultato, oppure None se è stato letto dalla cache.
+        """
+        if self.result_cache is None:
+            return ResultCache.run_solver(solver, algorithm_method)
+        cache_key = f"{algorithm_name} ε={self.epsilon}" if algorithm_name == 'FPTAS' else algorithm_name
+        result, cached = self.result_cache.solve(solver, cache_key, algorithm_method)
+        # Il tempo in cache è già nello storico: salvarlo di nuovo duplicherebbe una vecchia misurazione
+        return None if cached else result
+
+    def save_documents(self, documents):
+        """
+        Salva i documenti di un'istanza e li aggiunge al selettore condiviso, se già creato in questo processo.
+
+        :param documents: Documenti restituiti da solve_instance.
+        """
+        self.db_handler.save_instances(documents)
+        AlgorithmSelector.update_shared(documents)
+
+    def run_subset_sum_algorithms(self, progress=None):
+        """
+        Esegue gli algoritmi su tutte le istanze della campagna e salva i risultati nel database.
+
+        :param progress: Funzione chiamata dopo ogni istanza con il numero di istanze completate, il totale
+                         e il messaggio dell'istanza (opzionale).
+        :return: Numero di documenti salvati nel database.
+        """
+        if self.campaign_workers:
+            return self.run_parallel_campaign(progress)
+        tasks = self.get_instance_tasks()
+        try:
+            for completed, (args, message) in enumerate(tasks, start=1):
+                self.save_documents(self.solve_instance(*args))
+                if progress is not None:
+                    progress(completed, len(tasks), message)
+        finally:
+            self.db_handler.close()
+        return self.get_saved_count()
+
+    def run_parallel_campaign(self, progress=None):
+        """
+        Risolve le istanze su un ProcessPoolExecutor con campaign_workers processi. I risultati vengono raccolti man mano
+        che le istanze terminano e salvati a blocchi di BATCH_SIZE documenti dal gestore del database.
+
+        :param progress: Funzione chiamata dopo ogni istanza con il numero di istanze completate, il totale
+                         e il messaggio dell'istanza (opzionale).
+        :return: Numero di documenti salvati nel database.
+        """
+        tasks = self.get_instance_tasks()
+        executor = ProcessPoolExecutor(max_workers=self.campaign_workers)
+        try:
+            futures = {executor.submit(self.solve_instance, *args): message for args, message in tasks}
+            for completed, future in enumerate(as_completed(futures), start=1):
+                self.save_documents(future.result())
+                if progress is not None:
+                    progress(completed, len(tasks), futures[future])
+        finally:
+            # In caso di errore o annullamento le istanze non ancora avviate vengono scartate senza attenderle,
+            # mentre quelle già completate vengono salvate alla chiusura del gestore
+            executor.shutdown(wait=False, cancel_futures=True)
+            self.db_handler.close()
+        return self.get_saved_count()
+
+    def get_saved_count(self):
+        """
+        Restituisce il numero di documenti scritti nel database durante la campagna.
+        """
+        stats = self.db_handler.get_write_stats()
+        return stats['documents_written'] if stats is not None else 0
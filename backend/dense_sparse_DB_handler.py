@@ -1,60 +1,134 @@
 from pymongo import MongoClient, errors 
+from backend.buffered_writer import BufferedWriter
 
 class DenseSparseDBHandler:
     """
     Questa classe gestisce l'interazione con un database MongoDB per salvare, recuperare, eliminare e contare le istanze di set densi e sparsi.
     """
     
-    def __init__(self, db_name='subset_sum_db', collection_name='dense_sparse_instances'):
+    def __init__(self, db_name='subset_sum_db', collection_name='dense_sparse_instances', batch_size=None,
+                 flush_interval=1.0, server_selection_timeout_ms=None):
         """
         Inizializza una connessione al database MongoDB specificando il nome del database e della collezione.
+        Se batch_size è indicato, i salvataggi vengono accumulati in un BufferedWriter e scritti a blocchi di quella
+        dimensione, o quando il documento più vecchio attende da più di flush_interval secondi.
+        server_selection_timeout_ms limita l'attesa del server prima che un'operazione fallisca (se None, quella di pymongo).
         """
+        self.writer = None
+        options = {} if server_selection_timeout_ms is None else {'serverSelectionTimeoutMS': server_selection_timeout_ms}
         try:
-            self.client = MongoClient('localhost', 27017)
+            self.client = MongoClient('localhost', 27017, **options)
             self.db = self.client[db_name]
             self.collection = self.db[collection_name]  
+            if batch_size:
+                self.writer = BufferedWriter(self.collection, batch_size, flush_interval)
         except errors.ConnectionFailure as e:
             print(f"Errore di connessione al database: {e}")
 
-    def save_instance(self, S, T, instance_type, execution_time, optimal_solution, algorithm):
+    def save_instance(self, S, T, instance_type, execution_time, optimal_solution, algorithm, solution_count=None, is_partial=False,
+                      gap=None, approximation_ratio=None, source=None):
         """
-        Salva un'istanza nel database con le informazioni fornite (set, target, tipo di istanza, tempo di esecuzione, soluzione ottimale, algoritmo).
+        Salva un'istanza nel database con le informazioni fornite (set, target, tipo di istanza, tempo di esecuzione, soluzione ottimale,
+        numero di soluzioni, algoritmo). Per le esecuzioni interrotte dalla deadline vengono salvati anche is_partial e il gap
+        tra il target e la somma della soluzione parziale; per l'algoritmo approssimato la garanzia 1 - ε in approximation_ratio.
+        source indica l'origine dell'esecuzione (es. 'generator' per le campagne dei generatori).
         """
-        document = {
+        document = self.build_document(S, T, instance_type, execution_time, optimal_solution, algorithm, solution_count,
+                                       is_partial, gap, approximation_ratio, source)
+        try:
+            if self.writer is not None:
+                self.writer.add(document)
+            else:
+                self.collection.insert_one(document)
+        except errors.PyMongoError as e:
+            print(f"Errore durante il salvataggio dell'istanza: {e}")
+
+    @staticmethod
+    def build_document(S, T, instance_type, execution_time, optimal_solution, algorithm, solution_count=None, is_partial=False,
+                       gap=None, approximation_ratio=None, source=None):
+        """
+        Costruisce il documento salvato per l'esecuzione di un algoritmo su un'istanza, senza accedere al database
+        (può quindi essere usato anche nei processi di una campagna parallela). I parametri sono gli stessi di save_instance.
+        """
+        return {
             'set': S,
             'target_sum': T,
             'instance_type': instance_type,  
             'execution_time': execution_time,
             'optimal_solution': optimal_solution,
-            'algorithm': algorithm
+            # MongoDB gestisce interi fino a 8 byte: i conteggi più grandi vengono salvati come stringa
+            'solution_count': solution_count if solution_count is None or solution_count < 2 ** 63 else str(solution_count),
+            'is_partial': is_partial,
+            'gap': gap,
+            'approximation_ratio': approximation_ratio,
+            'algorithm': algorithm,
+            'source': source
         }
+
+    def save_instances(self, documents):
+        """
+        Salva più documenti, costruiti con build_document, con un'unica richiesta al database (o nel buffer, se attivo).
+        """
+        if not documents:
+            return
         try:
-            self.collection.insert_one(document)
+            if self.writer is not None:
+                self.writer.extend(documents)
+            else:
+                self.collection.insert_many(documents, ordered=False)
         except errors.PyMongoError as e:
-            print(f"Errore durante il salvataggio dell'istanza: {e}")
+            print(f"Errore durante il salvataggio delle istanze: {e}")
+
+    def flush(self):
+        """
+        Scrive i documenti ancora nel buffer, se attivo.
+        """
+        if self.writer is None:
+            return
+        try:
+            self.writer.flush()
+        except errors.PyMongoError as e:
+            print(f"Errore durante il salvataggio delle istanze: {e}")
+
+    def get_write_stats(self):
+        """
+        Restituisce i contatori delle scritture a blocchi (latenza e dimensione dei blocchi), None se il buffer non è attivo.
+        """
+        return self.writer.stats() if self.writer is not None else None
             
     def get_instances_by_type(self, instance_type):
         """
         Recupera tutte le istanze di un determinato tipo ('dense' o 'sparse') dal database.
         """
+        self.flush()
         return list(self.collection.find({"instance_type": instance_type}))
     
     def get_all_entries(self):
         """
         Recupera tutte le istanze dal database senza filtri.
         """
+        self.flush()
         return list(self.collection.find({}))
 
+    def get_entries_by_source(self, source):
+        """
+        Recupera le istanze salvate da una determinata origine (es. 'generator').
+        """
+        self.flush()
+        return list(self.collection.find({'source': source}))
+
     def get_instance_count(self):
         """
         Restituisce il conteggio di tutte le istanze presenti nella collezione.
         """
+        self.flush()
         return self.collection.count_documents({})
 
     def delete_all(self):
         """
         Elimina tutte le istanze presenti nella collezione.
         """
+        self.flush()
         try:
             self.collection.delete_many({})
             print("Tutte le istanze sono state eliminate con successo.")
@@ -63,6 +137,7 @@ class DenseSparseDBHandler:
 
     def close(self):
         """
-        Chiude la connessione al database.
+        Scrive i documenti ancora nel buffer e chiude la connessione al database.
         """
+        self.flush()
         self.client.close()
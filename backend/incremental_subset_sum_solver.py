@@ -0,0 +1,172 @@
+from collections import Counter
+from time import perf_counter
+import numpy as np
+from backend.subset_sum_calculator_for_analysis import SubsetSumSolver
+
+class IncrementalSubsetSumSolver:
+    """
+    Questa classe mantiene l'insieme delle somme raggiungibili (fino a max_target) di un set che viene modificato un elemento
+    alla volta, senza ripetere ogni volta la Programmazione Dinamica da zero.
+    Per ogni somma viene conservato il numero di sottoinsiemi che la raggiungono, modulo un primo grande: l'inserimento di x
+    somma al vettore dei conteggi la sua copia traslata di x, la rimozione esegue l'operazione inversa sottraendola.
+    Le somme raggiungibili sono mantenute anche in un bitset, aggiornato con un solo shift-OR a ogni inserimento, per cui
+    verificare un nuovo target richiede tempo costante.
+    Poiché i conteggi sono calcolati modulo PRIME, una somma raggiungibile viene considerata irraggiungibile solo se il numero
+    dei suoi sottoinsiemi è un multiplo di PRIME (probabilità dell'ordine di 1 / PRIME).
+    """
+
+    # Primo di Mersenne 2^31 - 1: le somme cumulative modulo PRIME su 2^32 posizioni restano entro gli interi a 64 bit
+    PRIME = 2 ** 31 - 1
+    # Ogni inserimento al più raddoppia i conteggi: la riduzione modulo PRIME può essere rimandata per 31 inserimenti
+    MAX_PENDING_INSERTS = 31
+
+    def __init__(self, S=(), max_target=0):
+        """
+        Inizializza il solver con un set iniziale.
+
+        :param S: Elementi iniziali del set (interi non negativi).
+        :param max_target: Target massimo interrogabile.
+        """
+        self.max_target = max(0, max_target)
+        self.S = []
+        self.counts = np.zeros(self.max_target + 1, dtype=np.int64)
+        self.counts[0] = 1
+        self.pending_inserts = 0
+        self.mask = (1 << (self.max_target + 1)) - 1
+        self.reach = 1
+        self.last_update_time = 0.0
+        self.update(S)
+
+    def insert(self, x):
+        """
+        Aggiunge un elemento al set aggiornando conteggi e bitset in O(max_target).
+
+        :param x: Elemento da aggiungere.
+        """
+        if x < 0:
+            raise ValueError("Il solver incrementale supporta solo elementi non negativi")
+        self.S.append(x)
+        if x > self.max_target:
+            return
+        if x == 0:
+            self.counts *= 2
+        else:
+            # Con slice sovrapposte NumPy usa i valori precedenti all'aggiornamento: ogni elemento viene usato una sola volta
+            self.counts[x:] += self.counts[:-x]
+            self.reach = (self.reach | (self.reach << x)) & self.mask
+        self.pending_inserts += 1
+        if self.pending_inserts >= self.MAX_PENDING_INSERTS:
+            self.normalize()
+
+    def normalize(self):
+        """
+        Riduce i conteggi modulo PRIME, se ci sono inserimenti non ancora ridotti.
+        """
+        if self.pending_inserts:
+            self.counts %= self.PRIME
+            self.pending_inserts = 0
+
+    def remove(self, x):
+        """
+        Rimuove un elemento dal set. Il vettore dei conteggi viene aggiornato invertendo l'inserimento,
+        c'[s] = c[s] - c'[s - x], che lungo ciascuna classe di resto modulo x è una somma a segni alterni.
+
+        :param x: Elemento da rimuovere.
+        :raises ValueError: Se l'elemento non è presente nel set.
+        """
+        self.S.remove(x)
+        if x > self.max_target:
+            return
+        self.normalize()
+        if x == 0:
+            self.counts = self.counts * ((self.PRIME + 1) // 2) % self.PRIME
+            return
+
+        size = len(self.counts)
+        rows = -(-size // x)
+        table = np.zeros(rows * x, dtype=np.int64)
+        table[:size] = self.counts
+        table = table.reshape(rows, x)
+        signs = np.where(np.arange(rows) % 2 == 0, 1, -1).reshape(rows, 1)
+        table = np.cumsum(table * signs, axis=0) % self.PRIME
+        self.counts = (table * signs % self.PRIME).reshape(-1)[:size]
+        self.reach = self.bitset_from_counts()
+
+    def update(self, S):
+        """
+        Porta il set del solver a coincidere con S, inserendo e rimuovendo solo gli elementi che differiscono.
+
+        :param S: Nuovo set.
+        :return: Liste degli elementi inseriti e rimossi.
+        """
+        start_time = perf_counter()
+        current = Counter(self.S)
+        target = Counter(S)
+        removed = list((current - target).elements())
+        inserted = list((target - current).elements())
+        for x in removed:
+            self.remove(x)
+        for x in inserted:
+            self.insert(x)
+        self.last_update_time = perf_counter() - start_time
+        return inserted, removed
+
+    def bitset_from_counts(self):
+        """
+        Ricostruisce il bitset delle somme raggiungibili dalle posizioni con conteggio non nullo.
+
+        :return: Intero il cui bit s vale 1 se la somma s è raggiungibile.
+        """
+        packed = np.packbits(self.counts != 0, bitorder='little')
+        return int.from_bytes(packed.tobytes(), 'little')
+
+    def __contains__(self, T):
+        """
+        Verifica in tempo costante se il target è raggiungibile.
+
+        :param T: Somma target.
+        :return: True se esiste un sottoinsieme con quella somma, altrimenti False.
+        """
+        if T < 0:
+            return False
+        if T > self.max_target:
+            raise ValueError(f"Il target {T} supera il massimo gestito dal solver ({self.max_target})")
+        return bool((self.reach >> T) & 1)
+
+    def count(self, T):
+        """
+        Restituisce il numero di sottoinsiemi che sommano al target, modulo PRIME.
+
+        :param T: Somma target.
+        :return: Numero di sottoinsiemi modulo PRIME.
+        """
+        if T < 0:
+            return 0
+        if T > self.max_target:
+            raise ValueError(f"Il target {T} supera il massimo gestito dal solver ({self.max_target})")
+        return int(self.counts[T] % self.PRIME)
+
+    def solve(self, T):
+        """
+        Verifica se il target è raggiungibile e, solo in quel caso, ricostruisce un sottoinsieme testimone con una
+        Programmazione Dinamica su bitset limitata a T.
+
+        :param T: Somma target.
+        :return: Lista degli elementi della soluzione (vuota se T non è raggiungibile) e tempo di esecuzione.
+        """
+        start_time = perf_counter()
+        if T not in self:
+            return [], perf_counter() - start_time
+
+        mask = (1 << (T + 1)) - 1
+        reach = 1
+        history = [reach]
+        for x in self.S:
+            if 0 < x <= T:
+                reach = (reach | (reach << x)) & mask
+            history.append(reach)
+            if (reach >> T) & 1:
+                break
+
+        steps = SubsetSumSolver.trace_bitset_history(history, self.S, T)
+        return [self.S[i] for i in steps], perf_counter() - start_time
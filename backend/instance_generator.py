@@ -1,76 +1,92 @@
 import random
 import logging
-import gc
 from backend.subset_sum_calculator_for_analysis import SubsetSumSolver
+from backend.algorithm_selector import AlgorithmSelector
 from backend.mongo_DB_handler import MongoDBHandler
+from backend.campaign_generator import CampaignGenerator
 
-class SubsetInstanceGeneratorWithS:
+class SubsetInstanceGeneratorWithS(CampaignGenerator):
     """
     Questa classe genera istanze del problema del subset sum utilizzando un numero fisso di elementi e un target, 
     esegue vari algoritmi per risolvere il problema e salva i risultati in un database.
     """
 
-    def __init__(self, num_instances, target, s, seed=None):
+    def __init__(self, num_instances, target, s, seed=None, deadline=None, epsilon=None, result_cache=None,
+                 campaign_workers=None, exact_counts=False):
         """
         Inizializza i parametri per la generazione delle istanze e configura il gestore del database.
+        I parametri seed, deadline, epsilon, result_cache, campaign_workers ed exact_counts sono descritti in CampaignGenerator.
         
         :param num_instances: Numero di istanze da generare.
         :param target: Valore target per il problema del subset sum.
         :param s: Numero di elementi nel set S.
-        :param seed: Seed per la generazione casuale.
         """
+        # I risultati vengono accumulati e scritti a blocchi, fuori dalle misurazioni dei tempi
+        super().__init__(MongoDBHandler(batch_size=self.BATCH_SIZE), seed, deadline, epsilon, result_cache,
+                         campaign_workers, exact_counts)
         self.num_instances = num_instances
         self.target = target
         self.s = s
-        self.seed = seed
-
-        if self.seed is not None:
-            random.seed(self.seed)
-
-        self.db_handler = MongoDBHandler()  
 
         logging.basicConfig(level=logging.INFO)
         self.logger = logging.getLogger(__name__)
 
-    def generate_instance(self):
+    def get_instance_tasks(self):
+        """
+        Elenca le istanze della campagna, ciascuna con un seed derivato dal seed della campagna.
+
+        :return: Lista di coppie (argomenti di solve_instance, messaggio di avanzamento).
+        """
+        return [((instance_seed,), "") for instance_seed in self.spawn_instance_seeds(self.num_instances)]
+
+    def generate_instance(self, rng=random):
         """
         Genera un'istanza del problema con un set di s elementi casuali e un target prestabilito.
         
+        :param rng: Generatore di numeri casuali da utilizzare.
         :return: Una tupla contenente il set S e il target T.
         """
-        S = [random.randint(1, 10000) for _ in range(self.s)]
+        S = [rng.randint(1, 10000) for _ in range(self.s)]
         return S, self.target
 
-    def run_subset_sum_algorithms(self):
+    def solve_instance(self, instance_seed):
         """
-        Esegue i vari algoritmi per risolvere il problema del subset sum sulle istanze generate e salva i risultati nel database.
-        """
-        try:
-            for i in range(self.num_instances):
-                S, target = self.generate_instance()
-                solver = SubsetSumSolver(S, target)
+        Genera l'istanza corrispondente a un seed, esegue tutti gli algoritmi e restituisce i documenti da salvare.
 
-                algorithms = [
-                    ("Dynamic Programming", solver.calculate_dynamic_programming),
-                    ("Backtracking", solver.calculate_backtracking),
-                    ("Meet In The Middle", solver.calculate_meet_in_the_middle),
-                ]
+        :param instance_seed: Seed dell'istanza.
+        :return: Lista dei documenti, uno per algoritmo.
+        """
+        S, target = self.generate_instance(random.Random(instance_seed))
+        solver = SubsetSumSolver(S, target, deadline=self.deadline, epsilon=self.epsilon)
+        solution_count = self.count_instance_solutions(solver)
 
-                for algorithm_name, algorithm_method in algorithms:
-                    try:
-                        optimal_solution, execution_time = algorithm_method()
-                        self.db_handler.save_instance(
-                            S=S,
-                            T=target,
-                            execution_time=execution_time,
-                            optimal_solution=optimal_solution,
-                            algorithm=algorithm_name
-                        )
-                    except Exception as e:
-                        self.logger.error(f"Errore durante l'esecuzione di {algorithm_name}: {e}")
-                        continue
+        algorithms = [
+            ("Dynamic Programming", solver.calculate_dynamic_programming),
+            ("Backtracking", solver.calculate_backtracking),
+            ("Meet In The Middle", solver.calculate_meet_in_the_middle),
+        ]
+        if self.epsilon is not None:
+            algorithms.append(("FPTAS", solver.calculate_fptas))
 
-                del S, target, solver
-                gc.collect()
-        finally:
-            self.db_handler.close()
+        documents = []
+        for algorithm_name, algorithm_method in algorithms:
+            try:
+                result = self.run_algorithm(solver, algorithm_name, algorithm_method)
+                if result is None:
+                    continue
+                documents.append(MongoDBHandler.build_document(
+                    S=S,
+                    T=target,
+                    execution_time=result['execution_time'],
+                    optimal_solution=result['solution'],
+                    algorithm=algorithm_name,
+                    solution_count=solution_count,
+                    is_partial=result['is_partial'],
+                    gap=result['gap'],
+                    approximation_ratio=result['approximation_ratio'],
+                    source=AlgorithmSelector.TRAINING_SOURCE
+                ))
+            except Exception as e:
+                self.logger.error(f"Errore durante l'esecuzione di {algorithm_name}: {e}")
+                continue
+        return documents
@@ -1,75 +1,120 @@
 import random
-import gc
 from backend.subset_sum_calculator_for_analysis import SubsetSumSolver
+from backend.algorithm_selector import AlgorithmSelector
 from backend.dense_sparse_DB_handler import DenseSparseDBHandler
+from backend.campaign_generator import CampaignGenerator
 
-class SubsetInstanceGenerator:
+class SubsetInstanceGenerator(CampaignGenerator):
     """
     Questa classe genera istanze di problemi del subset sum, le esegue con diversi algoritmi e salva i risultati in un database.
     """
+
+    # Target ridotto massimo per cui viene eseguito l'algoritmo FFT, che usa memoria proporzionale a T
+    FFT_TARGET_LIMIT = 10 ** 7
+    # Nomi salvati nel database per i metodi il cui nome non si ricava dal nome del metodo
+    ALGORITHM_NAMES = {
+        'calculate_parallel_dynamic_programming': 'Parallel Dynamic Programming',
+        'calculate_fft_sumset': 'FFT Sumset',
+        'calculate_fptas': 'FPTAS',
+    }
     
-    def __init__(self, num_instances, min_size, max_size, max_value, is_partition=False):
+    def __init__(self, num_instances, min_size, max_size, max_value, is_partition=False, deadline=None, epsilon=None,
+                 workers=None, result_cache=None, seed=None, campaign_workers=None, exact_counts=False):
         """
         Inizializza i parametri per la generazione delle istanze.
+        I parametri deadline, epsilon, result_cache, seed, campaign_workers ed exact_counts sono descritti in CampaignGenerator.
         
         :param num_instances: Numero di istanze da generare.
         :param min_size: Dimensione minima del set.
         :param max_size: Dimensione massima del set.
         :param max_value: Valore massimo per un elemento del set.
         :param is_partition: Se True, imposta il target come metà della somma del set.
+        :param workers: Se indicato, la Programmazione Dinamica viene eseguita in parallelo su questo numero di processi.
         """
+        # I risultati vengono accumulati e scritti a blocchi, fuori dalle misurazioni dei tempi
+        super().__init__(DenseSparseDBHandler(batch_size=self.BATCH_SIZE), seed, deadline, epsilon, result_cache,
+                         campaign_workers, exact_counts)
         self.num_instances = num_instances
         self.min_size = min_size
         self.max_size = max_size
         self.max_value = max_value
         self.is_partition = is_partition
-        self.db_handler = DenseSparseDBHandler()
+        self.workers = workers
+
+    def get_instance_tasks(self):
+        """
+        Elenca le istanze della campagna, prima quelle dense e poi quelle sparse, ciascuna con un seed derivato dal seed
+        della campagna. Il messaggio di avanzamento è la densità dell'istanza.
+
+        :return: Lista di coppie (argomenti di solve_instance, messaggio di avanzamento).
+        """
+        densities = ['dense'] * self.num_instances + ['sparse'] * self.num_instances
+        seeds = self.spawn_instance_seeds(2 * self.num_instances)
+        return [((density, instance_seed), density) for density, instance_seed in zip(densities, seeds)]
 
-    def generate_instance(self, size, density):
+    def generate_instance(self, size, density, rng=random):
         """
         Genera un'istanza densa o sparsa in base alla densità specificata.
         
         :param size: Dimensione del set.
         :param density: Tipo di densità ('dense' o 'sparse').
+        :param rng: Generatore di numeri casuali da utilizzare.
         :return: Un tuple contenente il set S e il target T.
         """
         max_element = self.max_value // 10 if density == 'dense' else self.max_value
-        S = [random.randint(1, max_element) for _ in range(size)]
+        S = [rng.randint(1, max_element) for _ in range(size)]
         total_sum = sum(S)
-        target = total_sum // 2 if self.is_partition else int(random.uniform(0.4, 0.6) * total_sum)
+        target = total_sum // 2 if self.is_partition else int(rng.uniform(0.4, 0.6) * total_sum)
         return S, target
 
-    def run_subset_sum_algorithms(self):
+    def solve_instance(self, density, instance_seed):
         """
-        Esegue diversi algoritmi di subset sum su tutte le istanze generate e salva i risultati nel database.
+        Genera l'istanza corrispondente a un seed, esegue tutti gli algoritmi e restituisce i documenti da salvare.
+
+        :param density: Tipo di densità ('dense' o 'sparse').
+        :param instance_seed: Seed dell'istanza.
+        :return: Lista dei documenti, uno per algoritmo.
         """
-        try:
-            for density in ['dense', 'sparse']:
-                for _ in range(self.num_instances):
-                    size = random.randint(self.min_size, self.max_size)
-                    S, target = self.generate_instance(size, density)
-                    solver = SubsetSumSolver(S, target)
+        rng = random.Random(instance_seed)
+        size = rng.randint(self.min_size, self.max_size)
+        S, target = self.generate_instance(size, density, rng)
+        solver = SubsetSumSolver(S, target, deadline=self.deadline, epsilon=self.epsilon, workers=self.workers)
+        solution_count = self.count_instance_solutions(solver)
+
+        algorithm_methods = [
+            solver.calculate_parallel_dynamic_programming if self.workers else solver.calculate_dynamic_programming,
+            solver.calculate_meet_in_the_middle,
+            solver.calculate_backtracking,
+            solver.calculate_schroeppel_shamir
+        ]
+        if solver.T <= self.FFT_TARGET_LIMIT:
+            algorithm_methods.append(solver.calculate_fft_sumset)
+        if self.epsilon is not None:
+            algorithm_methods.append(solver.calculate_fptas)
 
-                    for algorithm_method in [
-                        solver.calculate_dynamic_programming,
-                        solver.calculate_meet_in_the_middle,
-                        solver.calculate_backtracking
-                    ]:
-                        try:
-                            solution, exec_time = algorithm_method()
-                            algorithm_name = algorithm_method.__name__.replace('calculate_', '').replace('_', ' ').title()
-                            self.db_handler.save_instance(
-                                S=S,
-                                T=target,
-                                instance_type=density,
-                                execution_time=exec_time,
-                                optimal_solution=solution,
-                                algorithm=algorithm_name
-                            )
-                        except Exception as e:
-                            print(f"Errore durante l'esecuzione di {algorithm_method.__name__}: {e}")
-                    
-                    del S, target, solver
-                    gc.collect()
-        finally:
-            self.db_handler.close()
+        documents = []
+        for algorithm_method in algorithm_methods:
+            try:
+                algorithm_name = self.ALGORITHM_NAMES.get(
+                    algorithm_method.__name__,
+                    algorithm_method.__name__.replace('calculate_', '').replace('_', ' ').title()
+                )
+                result = self.run_algorithm(solver, algorithm_name, algorithm_method)
+                if result is None:
+                    continue
+                documents.append(DenseSparseDBHandler.build_document(
+                    S=S,
+                    T=target,
+                    instance_type=density,
+                    execution_time=result['execution_time'],
+                    optimal_solution=result['solution'],
+                    algorithm=algorithm_name,
+                    solution_count=solution_count,
+                    is_partial=result['is_partial'],
+                    gap=result['gap'],
+                    approximation_ratio=result['approximation_ratio'],
+                    source=AlgorithmSelector.TRAINING_SOURCE
+                ))
+            except Exception as e:
+                print(f"Errore durante l'esecuzione di {algorithm_method.__name__}: {e}")
+        return documents
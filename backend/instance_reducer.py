@@ -0,0 +1,148 @@
+import functools
+from collections import Counter
+from math import gcd
+from time import perf_counter
+
+class InstanceReducer:
+    """
+    Questa classe applica a un'istanza del subset sum una serie di riduzioni condivise da tutti gli algoritmi, prima che
+    questi vengano eseguiti, e permette di riportare la soluzione trovata sull'istanza ridotta agli elementi originali.
+    Le riduzioni applicate, nell'ordine, sono:
+    - eliminazione degli elementi maggiori di T;
+    - divisione di tutti gli elementi e del target per il loro MCD (se T non è divisibile l'istanza non ha soluzione);
+    - risoluzione immediata dei casi banali (T == 0, T > somma(S), T == somma(S), un elemento uguale a T);
+    - sostituzione di T con somma(S) - T quando è più piccolo, cercando il complementare della soluzione;
+    - raggruppamento degli elementi duplicati in coppie valore/molteplicità.
+    """
+
+    def __init__(self, S, T, allow_complement=True, short_circuit=True):
+        """
+        Calcola l'istanza ridotta a partire dal set S e dal target T.
+
+        :param S: Lista di numeri interi che rappresentano il set.
+        :param T: Somma target da raggiungere.
+        :param allow_complement: Se False, il target non viene mai sostituito con somma(S) - T.
+        :param short_circuit: Se False, i casi banali risolvibili non vengono chiusi in anticipo (ma quelli senza soluzione sì),
+                              utile quando serve l'istanza ridotta completa, ad esempio per contare le soluzioni.
+        """
+        start_time = perf_counter()
+        self.original_S = S
+        self.original_T = T
+        self.is_trivial = False
+        self.trivial_solution = None
+        self.gcd = 1
+        self.complemented = False
+        self.kept = []
+        self.zeros = sum(1 for x in S if x == 0)
+        self.values = []
+        self.multiplicities = []
+        self.S = S
+        self.T = T
+        self.reduce(allow_complement, short_circuit)
+        self.elapsed = perf_counter() - start_time
+
+    def reduce(self, allow_complement, short_circuit):
+        """
+        Applica le riduzioni all'istanza, aggiornando gli attributi S, T, values e multiplicities oppure, nei casi banali,
+        impostando direttamente la soluzione in trivial_solution.
+
+        :param allow_complement: Se False, il target non viene mai sostituito con somma(S) - T.
+        :param short_circuit: Se False, risolve in anticipo solo i casi senza soluzione.
+        """
+        S, T = self.original_S, self.original_T
+        if any(x < 0 for x in S):
+            # Con elementi negativi le riduzioni non sono valide: l'istanza viene lasciata invariata
+            self.values, self.multiplicities = self.group_duplicates(S)
+            return
+
+        if T < 0:
+            return self.set_trivial([])
+        if short_circuit and T == 0:
+            return self.set_trivial([])
+
+        kept = [x for x in S if 0 < x <= T]
+        total = sum(kept)
+        if total < T:
+            return self.set_trivial([])
+        if short_circuit and total == T:
+            return self.set_trivial(kept)
+        if short_circuit and T in kept:
+            return self.set_trivial([T])
+
+        g = 0
+        for x in kept:
+            g = gcd(g, x)
+        g = g or 1
+        if T % g != 0:
+            return self.set_trivial([])
+        self.gcd = g
+        kept = [x // g for x in kept]
+        T //= g
+        total //= g
+
+        if allow_complement and total - T < T:
+            T = total - T
+            self.complemented = True
+
+        self.kept = kept
+        self.values, self.multiplicities = self.group_duplicates([x for x in kept if x <= T])
+        self.S = [value for value, count in zip(self.values, self.multiplicities) for _ in range(count)]
+        self.T = T
+
+    def set_trivial(self, solution):
+        """
+        Segna l'istanza come risolta dalle riduzioni, senza bisogno di eseguire alcun algoritmo.
+
+        :param solution: Soluzione sugli elementi originali (lista vuota se non esiste).
+        """
+        self.is_trivial = True
+        self.trivial_solution = solution
+
+    @staticmethod
+    def group_duplicates(S):
+        """
+        Raggruppa gli elementi duplicati del set in coppie valore/molteplicità, nell'ordine di prima apparizione.
+
+        :param S: Lista di numeri interi.
+        :return: Lista dei valori distinti e lista parallela delle rispettive molteplicità.
+        """
+        counts = Counter(S)
+        return list(counts.keys()), list(counts.values())
+
+    def expand(self, solution):
+        """
+        Riporta una soluzione dell'istanza ridotta sugli elementi dell'istanza originale.
+
+        :param solution: Lista di elementi dell'istanza ridotta che sommano al target ridotto.
+        :return: Lista di elementi dell'istanza originale che sommano al target originale.
+        """
+        if not solution or not self.kept:
+            return solution
+        chosen = Counter(solution)
+        if self.complemented:
+            chosen = Counter(self.kept) - chosen
+        return [value * self.gcd for value in chosen.elements()]
+
+
+def reduced_engine(method):
+    """
+    Decoratore per i metodi calculate_* dei solver: se l'istanza è stata risolta dalle riduzioni restituisce subito il
+    risultato costruito da build_trivial_result, altrimenti esegue l'algoritmo sull'istanza ridotta e riporta la soluzione
+    (primo elemento del risultato) sugli elementi originali. Le chiamate annidate tra metodi decorati non vengono
+    espanse due volte.
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        reduction = getattr(self, 'reduction', None)
+        if reduction is None or self.reduction_depth > 0:
+            return method(self, *args, **kwargs)
+        if reduction.is_trivial:
+            return self.build_trivial_result(reduction.trivial_solution, reduction.elapsed)
+
+        self.reduction_depth += 1
+        try:
+            result = method(self, *args, **kwargs)
+        finally:
+            self.reduction_depth -= 1
+        return (reduction.expand(result[0]),) + tuple(result[1:])
+    return wrapper
@@ -1,4 +1,5 @@
 from pymongo import MongoClient
+from backend.buffered_writer import BufferedWriter
 
 class MongoDBHandler:
     """
@@ -6,17 +7,25 @@ class MongoDBHandler:
     come salvare, recuperare, contare e cancellare le istanze.
     """
 
-    def __init__(self, db_name='subset_sum_db'):
+    def __init__(self, db_name='subset_sum_db', batch_size=None, flush_interval=1.0, server_selection_timeout_ms=None):
         """
         Inizializza una connessione al server MongoDB e seleziona il database e la collezione specificata.
         
         :param db_name: Nome del database da utilizzare.
+        :param batch_size: Se indicato, i salvataggi vengono accumulati in un BufferedWriter e scritti a blocchi
+                           di questa dimensione; altrimenti ogni salvataggio è scritto immediatamente.
+        :param flush_interval: Attesa massima in secondi di un documento nel buffer (solo con batch_size).
+        :param server_selection_timeout_ms: Attesa massima in millisecondi del server prima che un'operazione fallisca
+                                            (se None, quella predefinita di pymongo).
         """
-        self.client = MongoClient('localhost', 27017)
+        options = {} if server_selection_timeout_ms is None else {'serverSelectionTimeoutMS': server_selection_timeout_ms}
+        self.client = MongoClient('localhost', 27017, **options)
         self.db = self.client[db_name]
         self.collection = self.db['instances']
+        self.writer = BufferedWriter(self.collection, batch_size, flush_interval) if batch_size else None
 
-    def save_instance(self, S, T, execution_time, optimal_solution, algorithm):
+    def save_instance(self, S, T, execution_time, optimal_solution, algorithm, solution_count=None, is_partial=False, gap=None,
+                      approximation_ratio=None, source=None):
         """
         Salva un'istanza nel database con le informazioni fornite (set, target, tempo di esecuzione, soluzione ottimale, algoritmo).
         
@@ -25,34 +34,95 @@ class MongoDBHandler:
         :param execution_time: Tempo di esecuzione dell'algoritmo.
         :param optimal_solution: Soluzione ottimale trovata.
         :param algorithm: Nome dell'algoritmo utilizzato.
+        :param solution_count: Numero di sottoinsiemi che sommano al target (opzionale).
+        :param is_partial: True se l'algoritmo è stato interrotto dalla deadline e la soluzione è parziale.
+        :param gap: Differenza tra il target e la somma della soluzione salvata (opzionale).
+        :param approximation_ratio: Garanzia 1 - ε dell'algoritmo approssimato, None per quelli esatti.
+        :param source: Origine dell'esecuzione (es. 'generator' per le campagne dei generatori), None per quelle della GUI.
         """
-        document = {
+        document = self.build_document(S, T, execution_time, optimal_solution, algorithm, solution_count, is_partial, gap,
+                                       approximation_ratio, source)
+        if self.writer is not None:
+            self.writer.add(document)
+        else:
+            self.collection.insert_one(document)
+
+    @staticmethod
+    def build_document(S, T, execution_time, optimal_solution, algorithm, solution_count=None, is_partial=False, gap=None,
+                       approximation_ratio=None, source=None):
+        """
+        Costruisce il documento salvato per l'esecuzione di un algoritmo su un'istanza, senza accedere al database
+        (può quindi essere usato anche nei processi di una campagna parallela).
+        I parametri sono gli stessi di save_instance.
+
+        :return: Dizionario del documento.
+        """
+        return {
             'set': S,
             'target_sum': T,
             'execution_time': execution_time,
             'optimal_solution': optimal_solution,
-            'algorithm': algorithm
+            # MongoDB gestisce interi fino a 8 byte: i conteggi più grandi vengono salvati come stringa
+            'solution_count': solution_count if solution_count is None or solution_count < 2 ** 63 else str(solution_count),
+            'is_partial': is_partial,
+            'gap': gap,
+            'approximation_ratio': approximation_ratio,
+            'algorithm': algorithm,
+            'source': source
         }
-        self.collection.insert_one(document)
+
+    def save_instances(self, documents):
+        """
+        Salva più documenti, costruiti con build_document, con un'unica richiesta al database (o nel buffer, se attivo).
+
+        :param documents: Lista di documenti da salvare.
+        """
+        if self.writer is not None:
+            self.writer.extend(documents)
+        elif documents:
+            self.collection.insert_many(documents, ordered=False)
+
+    def flush(self):
+        """
+        Scrive i documenti ancora nel buffer, se attivo.
+        """
+        if self.writer is not None:
+            self.writer.flush()
+
+    def get_write_stats(self):
+        """
+        Restituisce i contatori delle scritture a blocchi (latenza e dimensione dei blocchi), None se il buffer non è attivo.
+        """
+        return self.writer.stats() if self.writer is not None else None
         
     def count_entries(self):
         """
         Restituisce il numero totale di documenti presenti nella collezione.
         """
+        self.flush()
         return self.collection.count_documents({})  
 
     def delete_all(self):
         """
         Elimina tutti i documenti dalla collezione.
         """
+        self.flush()
         self.collection.delete_many({})
 
     def get_all_entries(self):
         """
         Recupera tutte le istanze presenti nella collezione e le restituisce come lista di documenti.
         """
+        self.flush()
         return list(self.collection.find({}))
 
+    def get_entries_by_source(self, source):
+        """
+        Recupera le istanze salvate da una determinata origine (es. 'generator').
+        """
+        self.flush()
+        return list(self.collection.find({'source': source}))
+
     def get_instance_count(self):
         """
         Restituisce il conteggio totale delle istanze presenti nella collezione.
@@ -61,6 +131,9 @@ class MongoDBHandler:
 
     def close(self):
         """
-        Chiude la connessione al server MongoDB.
+        Scrive i documenti ancora nel buffer e chiude la connessione al server MongoDB.
         """
-        self.client.close()
+        try:
+            self.flush()
+        finally:
+            self.client.close()
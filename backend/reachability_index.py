@@ -0,0 +1,81 @@
+import numpy as np
+
+class ReachabilityIndex:
+    """
+    Questa classe precalcola, una sola volta per un set S, tutte le somme di sottoinsiemi raggiungibili fino a un limite,
+    in modo da rispondere a molte interrogazioni "il target T è raggiungibile?" sullo stesso set senza ripetere il calcolo.
+    Le somme raggiungibili sono memorizzate in un vettore booleano, e per ciascuna somma un array int32 conserva l'indice
+    del primo elemento che l'ha resa raggiungibile, da cui si ricostruisce un sottoinsieme testimone.
+    """
+
+    def __init__(self, S, max_target=None):
+        """
+        Costruisce l'indice delle somme raggiungibili.
+
+        :param S: Lista di numeri interi che rappresentano il set.
+        :param max_target: Target massimo interrogabile (di default la somma degli elementi positivi di S).
+        """
+        self.S = list(S)
+        positive_sum = sum(x for x in self.S if x > 0)
+        self.max_target = positive_sum if max_target is None else max(0, min(max_target, positive_sum))
+        self.reachable = np.zeros(self.max_target + 1, dtype=np.bool_)
+        self.reachable[0] = True
+        self.first_index = np.full(self.max_target + 1, -1, dtype=np.int32)
+
+        for idx, num in enumerate(self.S):
+            if num <= 0 or num > self.max_target:
+                continue
+            new_sums = self.reachable[:-num] > self.reachable[num:]
+            self.reachable[num:] |= new_sums
+            self.first_index[num:][new_sums] = idx
+
+    def __contains__(self, target):
+        """
+        Verifica in tempo costante se il target è raggiungibile.
+
+        :param target: Somma da verificare.
+        :return: True se esiste un sottoinsieme con quella somma, altrimenti False.
+        """
+        return 0 <= target <= self.max_target and bool(self.reachable[target])
+
+    def query(self, target):
+        """
+        Verifica se il target è raggiungibile e, in caso affermativo, restituisce un sottoinsieme testimone.
+
+        :param target: Somma da raggiungere.
+        :return: Tupla (raggiungibile, lista degli elementi che sommano al target).
+        """
+        if target not in self:
+            return False, []
+        return True, self.witness(target)
+
+    def witness(self, target):
+        """
+        Ricostruisce un sottoinsieme con la somma richiesta risalendo l'array dei primi indici.
+
+        :param target: Somma raggiungibile.
+        :return: Lista degli elementi che sommano al target, lista vuota se il target non è raggiungibile.
+        """
+        if target not in self:
+            return []
+        solution = []
+        remaining = target
+        while remaining > 0:
+            num = self.S[self.first_index[remaining]]
+            solution.append(num)
+            remaining -= num
+        return solution[::-1]
+
+    def batch_query(self, targets):
+        """
+        Risponde in modo vettoriale a un insieme di interrogazioni.
+
+        :param targets: Array NumPy (o sequenza) di target.
+        :return: Array booleano di raggiungibilità e lista dei testimoni (lista vuota per i target non raggiungibili).
+        """
+        targets = np.asarray(targets, dtype=np.int64)
+        in_range = (targets >= 0) & (targets <= self.max_target)
+        found = np.zeros(targets.shape, dtype=np.bool_)
+        found[in_range] = self.reachable[targets[in_range]]
+        witnesses = [self.witness(int(t)) if ok else [] for t, ok in zip(targets.ravel(), found.ravel())]
+        return found, witnesses
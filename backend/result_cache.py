@@ -0,0 +1,198 @@
+import hashlib
+from collections import OrderedDict
+from pymongo import MongoClient, errors
+
+class ResultCache:
+    """
+    Questa classe conserva i risultati già calcolati dai solver, indicizzati dall'identificativo canonico dell'istanza
+    (md5 del set ordinato e del target), dal tipo di solver e dal nome dell'algoritmo, così che un'istanza ripetuta non venga
+    risolta di nuovo.
+    La cache ha due livelli: un LRU in memoria con dimensione massima e una collezione MongoDB persistente tra un'esecuzione
+    e l'altra. I risultati parziali (interrotti dalla deadline) non vengono salvati.
+    """
+
+    # Tipi di solver: i risultati del solver di analisi e di quello didattico non sono intercambiabili
+    ANALYSIS = 'analysis'
+    EDUCATIONAL = 'educational'
+
+    def __init__(self, max_size=1024, persistent=True, db_name='subset_sum_db', collection_name='result_cache'):
+        """
+        Inizializza la cache e, se richiesto, la connessione alla collezione persistente.
+
+        :param max_size: Numero massimo di risultati conservati in memoria.
+        :param persistent: Se True i risultati vengono salvati anche su MongoDB.
+        :param db_name: Nome del database da utilizzare.
+        :param collection_name: Nome della collezione dei risultati.
+        """
+        self.max_size = max_size
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.persistent_hits = 0
+        self.misses = 0
+        self.client = None
+        self.collection = None
+        if persistent:
+            try:
+                self.client = MongoClient('localhost', 27017)
+                self.collection = self.client[db_name][collection_name]
+            except errors.PyMongoError as e:
+                print(f"Errore di connessione al database, cache solo in memoria: {e}")
+
+    @staticmethod
+    def get_instance_id(S, T):
+        """
+        Restituisce l'identificativo canonico di un'istanza, calcolato come md5 del set ordinato e del target.
+
+        :param S: Lista di numeri interi che rappresentano il set.
+        :param T: Somma target.
+        :return: Stringa esadecimale dell'md5.
+        """
+        unique_str = str(tuple(sorted(S))) + '_' + str(T)
+        return hashlib.md5(unique_str.encode()).hexdigest()
+
+    def make_key(self, S, T, algorithm, kind=ANALYSIS):
+        """
+        Costruisce la chiave della cache per un'istanza, un tipo di solver e un algoritmo.
+
+        :param S: Set dell'istanza.
+        :param T: Target dell'istanza.
+        :param algorithm: Nome dell'algoritmo.
+        :param kind: Tipo di solver (ANALYSIS o EDUCATIONAL).
+        :return: Chiave della cache.
+        """
+        return f"{self.get_instance_id(S, T)}:{kind}:{algorithm}"
+
+    def get(self, S, T, algorithm, kind=ANALYSIS):
+        """
+        Cerca il risultato di un algoritmo per un'istanza, prima in memoria e poi nella collezione persistente.
+
+        :param S: Set dell'istanza.
+        :param T: Target dell'istanza.
+        :param algorithm: Nome dell'algoritmo.
+        :param kind: Tipo di solver (ANALYSIS o EDUCATIONAL).
+        :return: Dizionario del risultato ('solution', 'execution_time', 'is_partial', 'gap', 'approximation_ratio'),
+                 None se non presente.
+        """
+        key = self.make_key(S, T, algorithm, kind)
+        if key in self.entries:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return self.entries[key]
+
+        entry = None
+        if self.collection is not None:
+            try:
+                document = self.collection.find_one({'_id': key})
+            except errors.PyMongoError as e:
+                print(f"Errore durante la lettura della cache, cache solo in memoria: {e}")
+                self.collection = None
+                document = None
+            if document is not None:
+                entry = {field: document.get(field) for field in
+                         ('solution', 'execution_time', 'is_partial', 'gap', 'approximation_ratio')}
+                self.store(key, entry)
+                self.persistent_hits += 1
+
+        if entry is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return entry
+
+    def put(self, S, T, algorithm, entry, kind=ANALYSIS):
+        """
+        Salva il risultato di un algoritmo per un'istanza in entrambi i livelli della cache.
+
+        :param S: Set dell'istanza.
+        :param T: Target dell'istanza.
+        :param algorithm: Nome dell'algoritmo.
+        :param entry: Dizionario del risultato, come restituito da run_solver.
+        :param kind: Tipo di solver (ANALYSIS o EDUCATIONAL).
+        """
+        if entry.get('is_partial'):
+            return
+        key = self.make_key(S, T, algorithm, kind)
+        self.store(key, entry)
+        if self.collection is not None:
+            document = dict(entry, _id=key, instance_id=self.get_instance_id(S, T), kind=kind, algorithm=algorithm)
+            try:
+                self.collection.replace_one({'_id': key}, document, upsert=True)
+            except errors.PyMongoError as e:
+                print(f"Errore durante il salvataggio nella cache, cache solo in memoria: {e}")
+                self.collection = None
+
+    def store(self, key, entry):
+        """
+        Inserisce un risultato nel livello in memoria, eliminando il meno recente se si supera la dimensione massima.
+
+        :param key: Chiave della cache.
+        :param entry: Dizionario del risultato.
+        """
+        self.entries[key] = entry
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+
+    @staticmethod
+    def run_solver(solver, method):
+        """
+        Esegue un metodo calculate_* di un solver di analisi e ne raccoglie il risultato.
+
+        :param solver: Istanza di SubsetSumSolver (versione di analisi).
+        :param method: Metodo calculate_* legato al solver.
+        :return: Dizionario del risultato.
+        """
+        solution, execution_time = method()
+        return {
+            'solution': solution,
+            'execution_time': execution_time,
+            'is_partial': solver.is_partial,
+            'gap': solver.gap,
+            'approximation_ratio': solver.approximation_ratio,
+        }
+
+    def solve(self, solver, algorithm, method):
+        """
+        Restituisce il risultato in cache per l'istanza del solver di analisi, oppure esegue il metodo e lo salva nella cache.
+
+        :param solver: Istanza di SubsetSumSolver (versione di analisi).
+        :param algorithm: Nome dell'algoritmo usato come chiave.
+        :param method: Metodo calculate_* legato al solver.
+        :return: Dizionario del risultato e True se è stato letto dalla cache (e non è quindi una nuova misurazione).
+        """
+        entry = self.get(solver.original_S, solver.original_T, algorithm)
+        if entry is not None:
+            return entry, True
+        entry = self.run_solver(solver, method)
+        self.put(solver.original_S, solver.original_T, algorithm, entry)
+        return entry, False
+
+    def stats(self):
+        """
+        Restituisce i contatori di utilizzo della cache.
+
+        :return: Dizionario con hit totali, hit dal livello persistente, miss, percentuale di hit e dimensione in memoria.
+        """
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'persistent_hits': self.persistent_hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'size': len(self.entries),
+        }
+
+    def clear(self):
+        """
+        Svuota entrambi i livelli della cache.
+        """
+        self.entries.clear()
+        if self.collection is not None:
+            self.collection.delete_many({})
+
+    def close(self):
+        """
+        Chiude la connessione al server MongoDB.
+        """
+        if self.client is not None:
+            self.client.close()
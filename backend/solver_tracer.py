@@ -0,0 +1,225 @@
+import sys
+from array import array
+import numpy as np
+
+class SolverTracer:
+    """
+    Questa classe registra i passaggi eseguiti dal solver didattico come eventi compatti (codice operazione, i, t, valore)
+    in un buffer circolare preallocato, invece di formattare una stringa per ogni passaggio. Il testo viene prodotto solo
+    quando una riga viene effettivamente letta (ad esempio quando la GUI la mostra), per cui la classe si comporta come una
+    sequenza di stringhe.
+    Il livello di dettaglio è configurabile:
+    - OFF: nessuna registrazione (il solver non chiama nemmeno il tracer);
+    - COUNTERS: solo il numero di eventi per ciascun tipo;
+    - SAMPLED: contatori e un evento ogni sample_every;
+    - FULL: contatori e tutti gli eventi (gli ultimi capacity).
+    """
+
+    OFF = 0
+    COUNTERS = 1
+    SAMPLED = 2
+    FULL = 3
+    LEVEL_NAMES = {OFF: 'off', COUNTERS: 'contatori', SAMPLED: 'campionato', FULL: 'completo'}
+
+    # Codici delle operazioni registrate
+    NOTE = 0
+    DP_BASE = 1
+    DP_SKIP = 2
+    DP_INCLUDE = 3
+    DP_EXCLUDE_REACHABLE = 4
+    DP_EXCLUDE_UNREACHABLE = 5
+    MITM_CHECK = 6
+    MITM_FOUND = 7
+    BT_EXCLUDE = 8
+    OPCODE_NAMES = [
+        'Note', 'Casi base dp', 'Elementi troppo grandi', 'Inclusioni dp', 'Esclusioni dp (raggiungibile)',
+        'Esclusioni dp (non raggiungibile)', 'Controlli meet-in-the-middle', 'Soluzioni meet-in-the-middle',
+        'Esclusioni backtracking',
+    ]
+    # Ogni evento occupa quattro interi consecutivi nel buffer
+    EVENT_SIZE = 4
+
+    def __init__(self, level=FULL, capacity=100000, sample_every=100):
+        """
+        Inizializza il tracer e prealloca il buffer circolare.
+
+        :param level: Livello di dettaglio (OFF, COUNTERS, SAMPLED o FULL).
+        :param capacity: Numero massimo di eventi conservati; oltre questo limite i più vecchi vengono sovrascritti.
+        :param sample_every: Al livello SAMPLED viene conservato un evento ogni sample_every.
+        """
+        self.level = level
+        self.capacity = capacity
+        self.sample_every = max(1, sample_every)
+        self.events = array('q', bytes(8 * self.EVENT_SIZE * capacity if level >= self.SAMPLED else 0))
+        self.counts = [0] * len(self.OPCODE_NAMES)
+        self.notes = []
+        self.seen = 0
+        self.stored = 0
+
+    @property
+    def enabled(self):
+        """
+        Indica se il tracer registra qualcosa; quando è False il solver evita del tutto le chiamate.
+        """
+        return self.level > self.OFF
+
+    def record(self, opcode, i=0, t=0, value=0):
+        """
+        Registra un evento.
+
+        :param opcode: Codice dell'operazione.
+        :param i: Primo indice (ad esempio la riga della matrice dp).
+        :param t: Secondo indice (ad esempio la somma parziale).
+        :param value: Valore associato all'evento (ad esempio l'elemento considerato).
+        """
+        self.counts[opcode] += 1
+        if self.level < self.SAMPLED:
+            return
+        self.seen += 1
+        if self.level == self.SAMPLED and self.seen % self.sample_every:
+            return
+        self.store(opcode, i, t, value)
+
+    def add_count(self, opcode, count):
+        """
+        Aggiunge count eventi di un tipo ai contatori senza registrarli singolarmente: al livello COUNTERS il solver può
+        così ricavare i conteggi in blocco invece di chiamare record per ogni evento.
+
+        :param opcode: Codice dell'operazione.
+        :param count: Numero di eventi da aggiungere.
+        """
+        self.counts[opcode] += count
+
+    def store(self, opcode, i, t, value):
+        """
+        Scrive un evento nel buffer circolare, sovrascrivendo il più vecchio se il buffer è pieno.
+
+        :param opcode: Codice dell'operazione.
+        :param i: Primo indice.
+        :param t: Secondo indice.
+        :param value: Valore associato.
+        """
+        position = (self.stored % self.capacity) * self.EVENT_SIZE
+        events = self.events
+        try:
+            events[position + 1] = i
+            events[position + 2] = t
+            events[position + 3] = value
+        except OverflowError:
+            # Valori oltre i 64 bit: l'evento viene conservato come nota già formattata
+            self.notes.append(("{}", (self.render(opcode, i, t, value),)))
+            opcode, value = self.NOTE, len(self.notes) - 1
+            events[position + 3] = value
+        events[position] = opcode
+        self.stored += 1
+
+    def note(self, template, *args):
+        """
+        Registra un messaggio testuale; la formattazione del template con gli argomenti è rimandata alla lettura.
+        Le note sono poche e descrivono le fasi dell'algoritmo, per cui non vengono mai scartate dal campionamento.
+
+        :param template: Stringa di formato con segnaposti posizionali ({}).
+        :param args: Argomenti del messaggio.
+        """
+        if not self.enabled:
+            return
+        self.counts[self.NOTE] += 1
+        if self.level >= self.SAMPLED:
+            self.notes.append((template, args))
+            self.store(self.NOTE, 0, 0, len(self.notes) - 1)
+
+    def clear(self):
+        """
+        Elimina tutti gli eventi, le note e i contatori registrati.
+        """
+        self.counts = [0] * len(self.OPCODE_NAMES)
+        self.notes = []
+        self.seen = 0
+        self.stored = 0
+
+    @property
+    def dropped(self):
+        """
+        Numero di eventi conservati e poi sovrascritti perché il buffer era pieno.
+        """
+        return max(0, self.stored - self.capacity)
+
+    def __len__(self):
+        """
+        Numero di righe leggibili: gli eventi conservati oppure, al livello COUNTERS, i contatori non nulli.
+        """
+        if self.level == self.COUNTERS:
+            return sum(1 for count in self.counts if count)
+        if self.level < self.SAMPLED:
+            return 0
+        return min(self.stored, self.capacity)
+
+    def __getitem__(self, index):
+        """
+        Restituisce il testo di una riga (o di un intervallo di righe), formattandolo solo in questo momento.
+
+        :param index: Indice intero o slice.
+        :return: Stringa della riga o lista di stringhe.
+        """
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        size = len(self)
+        if index < 0:
+            index += size
+        if not 0 <= index < size:
+            raise IndexError("indice della traccia fuori intervallo")
+        if self.level == self.COUNTERS:
+            opcode, count = [(opcode, count) for opcode, count in enumerate(self.counts) if count][index]
+            return f"{self.OPCODE_NAMES[opcode]}: {count}"
+        position = ((self.dropped + index) % self.capacity) * self.EVENT_SIZE
+        return self.render(*self.events[position:position + self.EVENT_SIZE])
+
+    def __iter__(self):
+        """
+        Itera sulle righe leggibili, formattandole una alla volta.
+        """
+        for index in range(len(self)):
+            yield self[index]
+
+    def render(self, opcode, i, t, value):
+        """
+        Converte un evento nel testo mostrato all'utente.
+
+        :param opcode: Codice dell'operazione.
+        :param i: Primo indice.
+        :param t: Secondo indice.
+        :param value: Valore associato.
+        :return: Descrizione testuale dell'evento.
+        """
+        if opcode == self.NOTE:
+            template, args = self.notes[value]
+            return template.format(*[self.format_argument(arg) for arg in args])
+        if opcode == self.DP_BASE:
+            return f"dp[{i}][0] = True (somma 0 sempre possibile)"
+        if opcode == self.DP_SKIP:
+            return f"dp[{i}][{t}] = dp[{i-1}][{t}] (Escludo {value})"
+        if opcode == self.DP_INCLUDE:
+            return f"dp[{i}][{t}] = True (Includo {value})"
+        if opcode == self.DP_EXCLUDE_REACHABLE:
+            return f"dp[{i}][{t}] = True (Escludo {value})"
+        if opcode == self.DP_EXCLUDE_UNREACHABLE:
+            return f"dp[{i}][{t}] = False (Escludo {value})"
+        if opcode == self.MITM_CHECK:
+            return f"Controllo se esiste {t} per la somma {i}"
+        if opcode == self.MITM_FOUND:
+            return f"Trova sottoinsieme con somma {t} in seconda metà"
+        if opcode == self.BT_EXCLUDE:
+            return f"Escludo {value}"
+        return f"{self.OPCODE_NAMES[opcode]}: i={i}, t={t}, valore={value}"
+
+    @staticmethod
+    def format_argument(arg):
+        """
+        Formatta un argomento di una nota: gli array NumPy vengono mostrati come liste, abbreviate se molto lunghe.
+
+        :param arg: Argomento della nota.
+        :return: Argomento pronto per la formattazione del template.
+        """
+        if isinstance(arg, np.ndarray):
+            return np.array2string(arg, separator=', ', max_line_width=sys.maxsize)
+        return arg
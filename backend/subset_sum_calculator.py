@@ -1,100 +1,204 @@
-from itertools import combinations
 from time import perf_counter
-from collections import defaultdict
+import numpy as np
+from backend.instance_reducer import InstanceReducer, reduced_engine
+from backend.reachability_index import ReachabilityIndex
+from backend.solver_tracer import SolverTracer
+from backend.bit_matrix import BitMatrix
 
 class SubsetSumSolver:
     """
     Questa classe implementa tre metodi diversi per risolvere il problema del subset sum: Programmazione Dinamica,
-    Meet-in-the-Middle e Backtracking. Ciascun metodo include un'analisi dettagliata delle operazioni eseguite.
+    Meet-in-the-Middle e Backtracking. Ciascun metodo include un'analisi dettagliata delle operazioni eseguite, registrata
+    da un SolverTracer: i calcoli restituiti sono una sequenza il cui testo viene prodotto solo alla lettura.
     """
 
-    def __init__(self, S, T):
+    def __init__(self, S, T, reduce=True, tracer=None):
         """
         Inizializza il set S e il target T insieme a variabili per memorizzare i calcoli effettuati e il conteggio delle operazioni.
+        Se reduce è True l'istanza viene prima semplificata da InstanceReducer: i metodi lavorano sull'istanza ridotta
+        (self.S, self.T) e le soluzioni vengono riportate sugli elementi originali.
         
         :param S: Lista di numeri interi che rappresentano il set.
         :param T: Somma target da raggiungere.
+        :param reduce: Se True applica le riduzioni condivise prima di ogni algoritmo.
+        :param tracer: Tracer che registra i calcoli (di default un SolverTracer con livello FULL).
         """
-        self.S = S
-        self.T = T
-        self.calculations = []
+        self.original_S = S
+        self.original_T = T
+        self.reduction = InstanceReducer(S, T) if reduce else None
+        self.reduction_depth = 0
+        self.S = self.reduction.S if reduce else S
+        self.T = self.reduction.T if reduce else T
+        self.tracer = tracer if tracer is not None else SolverTracer()
+        self.calculations = self.tracer
         self.operations = 0
 
+    @reduced_engine
     def calculate_dynamic_programming(self):
         """
         Risoluzione con Programmazione Dinamica.
         Utilizza una matrice dp per determinare se è possibile ottenere una somma target T utilizzando un sottoinsieme degli elementi di S.
-        La matrice dp[i][t] rappresenta se è possibile ottenere la somma t utilizzando i primi i elementi del set S.
+        La matrice dp[i][t] rappresenta se è possibile ottenere la somma t utilizzando i primi i elementi del set S;
+        è memorizzata come BitMatrix, con un bit per cella.
         
-        :return: Soluzione ottimale, calcoli eseguiti, numero di operazioni, tempo di esecuzione, matrice dp.
+        :return: Soluzione ottimale, calcoli eseguiti, numero di operazioni, tempo di esecuzione, matrice dp (BitMatrix).
         """
         start_time = perf_counter()
         n = len(self.S)
-        dp = [[False] * (self.T + 1) for _ in range(n + 1)]
-        
+        # Matrice a un bit per cella: ogni riga è ottenuta dalla precedente con uno shift-OR su interi
+        dp = BitMatrix(n + 1, self.T + 1)
+        # Il ciclo sulle singole celle serve solo ai livelli che conservano gli eventi: al livello COUNTERS i conteggi
+        # vengono ricavati in blocco dai bit delle righe, con il tracer disattivato non viene eseguita alcuna chiamata
+        record = self.tracer.record if self.tracer.level >= SolverTracer.SAMPLED else None
+        count_rows = self.tracer.level == SolverTracer.COUNTERS
+
         for i in range(n + 1):
-            dp[i][0] = True
-            self.calculations.append(f"dp[{i}][0] = True (somma 0 sempre possibile)")
-            self.operations += 1
+            dp.set(i, 0)
+            if record:
+                record(SolverTracer.DP_BASE, i)
+        if count_rows:
+            self.tracer.add_count(SolverTracer.DP_BASE, n + 1)
+        self.operations += n + 1
 
+        mask = (1 << (self.T + 1)) - 1
+        previous_bits = 1
         for i in range(1, n + 1):
-            for t in range(1, self.T + 1):
-                if self.S[i - 1] > t:
-                    dp[i][t] = dp[i - 1][t]
-                    self.calculations.append(f"dp[{i}][{t}] = dp[{i-1}][{t}] (Escludo {self.S[i-1]})")
-                else:
-                    dp[i][t] = dp[i - 1][t] or dp[i - 1][t - self.S[i - 1]]
-                    action = f"Includo {self.S[i-1]}" if dp[i - 1][t - self.S[i - 1]] else f"Escludo {self.S[i-1]}"
-                    self.calculations.append(f"dp[{i}][{t}] = {dp[i][t]} ({action})")
-                self.operations += 1
+            x = self.S[i - 1]
+            row_bits = (previous_bits | (previous_bits << x)) & mask
+            dp.set_row_bits(i, row_bits)
+            if record:
+                previous = dp.data[i - 1]
+                for t in range(1, self.T + 1):
+                    if x > t:
+                        record(SolverTracer.DP_SKIP, i, t, x)
+                    elif (previous[(t - x) >> 3] >> ((t - x) & 7)) & 1:
+                        record(SolverTracer.DP_INCLUDE, i, t, x)
+                    elif (previous[t >> 3] >> (t & 7)) & 1:
+                        record(SolverTracer.DP_EXCLUDE_REACHABLE, i, t, x)
+                    else:
+                        record(SolverTracer.DP_EXCLUDE_UNREACHABLE, i, t, x)
+            elif count_rows:
+                self.count_dp_row(previous_bits, x)
+            previous_bits = row_bits
+            self.operations += self.T
 
         execution_time = perf_counter() - start_time
         optimal_solution = self.find_solution(dp, self.S, self.T)
         return optimal_solution, self.calculations, self.operations, execution_time, dp
 
+    def count_dp_row(self, previous_bits, x):
+        """
+        Aggiunge ai contatori del tracer gli eventi di una riga della matrice dp (colonne 1..T), ricavandoli con maschere e
+        conteggi di bit sulla riga precedente invece di esaminare le singole celle: le colonne t < x sono elementi troppo
+        grandi, tra le altre le inclusioni sono quelle con dp[i-1][t-x] vero e le esclusioni raggiungibili quelle con
+        dp[i-1][t-x] falso e dp[i-1][t] vero.
+
+        :param previous_bits: Riga precedente della matrice come intero, il cui bit t è dp[i-1][t].
+        :param x: Elemento della riga.
+        """
+        T = self.T
+        first = max(x, 1)
+        skipped = min(first, T + 1) - 1
+        columns = max(0, T - first + 1)
+        if columns:
+            window = ((1 << columns) - 1) << first
+            included = bin((previous_bits << x) & window).count('1')
+            reachable = bin(previous_bits & ~(previous_bits << x) & window).count('1')
+        else:
+            included = reachable = 0
+        tracer = self.tracer
+        tracer.add_count(SolverTracer.DP_SKIP, skipped)
+        tracer.add_count(SolverTracer.DP_INCLUDE, included)
+        tracer.add_count(SolverTracer.DP_EXCLUDE_REACHABLE, reachable)
+        tracer.add_count(SolverTracer.DP_EXCLUDE_UNREACHABLE, columns - included - reachable)
+
+    @reduced_engine
     def calculate_meet_in_the_middle(self):
         """
         Risoluzione con Meet-in-the-Middle.
         Divide il set S in due metà, calcola tutte le possibili somme di sottoinsiemi per ciascuna metà e verifica se esistono combinazioni
         di somme che diano il target T. Questa tecnica è efficace per ridurre il tempo di calcolo con set di grandi dimensioni.
+        Per ogni somma distinta viene conservata una sola bitmask del sottoinsieme che la ottiene, in array ordinati per somma.
         
         :return: Soluzione ottimale, calcoli eseguiti, numero di operazioni, tempo di esecuzione, matrice vuota.
         """
         start_time = perf_counter()
 
-        def get_subset_sums(arr):
-            subset_sums = defaultdict(list)
-            for r in range(len(arr) + 1):
-                for subset in combinations(arr, r):
-                    subset_sum = sum(subset)
-                    subset_sums[subset_sum].append(subset)
-            return subset_sums
-
         mid = len(self.S) // 2
         first_half = self.S[:mid]
         second_half = self.S[mid:]
-        sum_first_half = get_subset_sums(first_half)
-        sum_second_half = get_subset_sums(second_half)
-        second_half_sums = set(sum_second_half.keys())
+        first_sums, first_masks = self.get_subset_sum_masks(first_half)
+        second_sums, second_masks = self.get_subset_sum_masks(second_half)
 
-        self.operations = 0
-        self.calculations.append(f"Somme sottoinsieme della prima metà: {list(sum_first_half.keys())}")
-        self.calculations.append(f"Somme sottoinsieme della seconda metà: {list(second_half_sums)}")
+        # Le somme vengono passate al tracer come array: la conversione in testo avviene solo alla lettura
+        self.tracer.note("Somme sottoinsieme della prima metà: {}", first_sums)
+        self.tracer.note("Somme sottoinsieme della seconda metà: {}", second_sums)
 
-        for x in sum_first_half.keys():
-            self.operations += 1
-            y = self.T - x
-            if y in second_half_sums:
-                execution_time = perf_counter() - start_time
-                self.calculations.append(f"Trova sottoinsieme con somma {y} in seconda metà")
-                solution = list(sum_first_half[x][0]) + list(sum_second_half[y][0])
-                return solution, self.calculations, self.operations, execution_time, []
+        if abs(self.T) >= 2 ** 62:
+            first_sums, second_sums = first_sums.astype(object), second_sums.astype(object)
+
+        # Per ogni somma x della prima metà si cerca T - x tra le somme ordinate della seconda metà
+        complements = self.T - first_sums
+        positions = np.searchsorted(second_sums, complements)
+        in_range = positions < len(second_sums)
+        matches = np.zeros(len(first_sums), dtype=np.bool_)
+        matches[in_range] = second_sums[positions[in_range]] == complements[in_range]
+        checked = int(np.argmax(matches)) + 1 if matches.any() else len(first_sums)
+        self.operations = checked
 
-            self.calculations.append(f"Controllo se esiste {y} per la somma {x}")
+        if self.tracer.enabled:
+            record = self.tracer.record
+            for k in range(checked):
+                record(SolverTracer.MITM_FOUND if matches[k] else SolverTracer.MITM_CHECK,
+                       int(first_sums[k]), int(complements[k]))
 
         execution_time = perf_counter() - start_time
-        return [], self.calculations, self.operations, execution_time, []
+        if not matches.any():
+            return [], self.calculations, self.operations, execution_time, []
+
+        k = checked - 1
+        solution = self.subset_from_mask(first_half, int(first_masks[k])) + \
+            self.subset_from_mask(second_half, int(second_masks[positions[k]]))
+        return solution, self.calculations, self.operations, execution_time, []
+
+    @staticmethod
+    def get_subset_sum_masks(arr):
+        """
+        Calcola le somme distinte dei sottoinsiemi di arr e, per ciascuna, la bitmask di un sottoinsieme che la ottiene
+        (il bit j indica che arr[j] è incluso). Gli elementi vengono aggiunti uno alla volta, fondendo le somme esistenti
+        con quelle traslate dell'elemento ed eliminando i duplicati, per cui la memoria è proporzionale al numero di somme
+        distinte.
+
+        :param arr: Lista di numeri interi.
+        :return: Array ordinato delle somme distinte e array parallelo delle bitmask.
+        """
+        # Con somme o bitmask oltre i 63 bit si usano array di interi Python
+        bound = sum(abs(x) for x in arr)
+        sum_dtype = np.int64 if bound < 2 ** 62 else object
+        mask_dtype = np.int64 if len(arr) < 63 else object
+
+        sums = np.zeros(1, dtype=sum_dtype)
+        masks = np.zeros(1, dtype=mask_dtype)
+        for j, x in enumerate(arr):
+            all_sums = np.concatenate((sums, sums + x))
+            all_masks = np.concatenate((masks, masks | (1 << j)))
+            # return_index restituisce la prima occorrenza: a parità di somma si conserva la bitmask già presente
+            sums, first = np.unique(all_sums, return_index=True)
+            masks = all_masks[first]
+        return sums, masks
+
+    @staticmethod
+    def subset_from_mask(arr, mask):
+        """
+        Restituisce gli elementi di arr selezionati da una bitmask.
+
+        :param arr: Lista di numeri interi.
+        :param mask: Bitmask in cui il bit j indica che arr[j] è incluso.
+        :return: Lista degli elementi selezionati.
+        """
+        return [x for j, x in enumerate(arr) if (mask >> j) & 1]
 
+    @reduced_engine
     def calculate_backtracking(self):
         """
         Risoluzione con Backtracking.
@@ -106,6 +210,7 @@ class SubsetSumSolver:
         start_time = perf_counter()
         S_sorted = sorted(self.S, reverse=True)
         memo = {}
+        record = self.tracer.record if self.tracer.enabled else None
 
         def backtrack(i, current_sum, current_numbers):
             if current_sum == self.T:
@@ -122,17 +227,38 @@ class SubsetSumSolver:
 
             include = backtrack(i + 1, current_sum + S_sorted[i], current_numbers + [S_sorted[i]])
             if include[0]:
-                self.calculations.append(f"Includo {S_sorted[i]}: {include[1]}")
+                self.tracer.note("Includo {}: {}", S_sorted[i], include[1])
                 return include
 
             exclude = backtrack(i + 1, current_sum, current_numbers)
-            self.calculations.append(f"Escludo {S_sorted[i]}")
+            if record:
+                record(SolverTracer.BT_EXCLUDE, i, current_sum, S_sorted[i])
             return exclude
 
         result = backtrack(0, 0, [])
         execution_time = perf_counter() - start_time
         return result[1], self.calculations, self.operations, execution_time, []
 
+    def build_reachability_index(self, max_target=None):
+        """
+        Costruisce un ReachabilityIndex sul set originale, per interrogare molti target diversi senza ripetere il calcolo.
+
+        :param max_target: Target massimo interrogabile (di default la somma degli elementi positivi del set).
+        :return: Istanza di ReachabilityIndex.
+        """
+        return ReachabilityIndex(self.original_S, max_target)
+
+    def build_trivial_result(self, solution, execution_time):
+        """
+        Costruisce il risultato restituito dai metodi calculate_* quando l'istanza è risolta direttamente dalle riduzioni.
+
+        :param solution: Soluzione sugli elementi originali.
+        :param execution_time: Tempo impiegato dalle riduzioni.
+        :return: Soluzione ottimale, calcoli eseguiti, numero di operazioni, tempo di esecuzione, matrice vuota.
+        """
+        self.tracer.note("Istanza risolta dalla fase di riduzione: {}", solution if solution else 'nessuna soluzione')
+        return solution, self.calculations, self.operations, execution_time, []
+
     @staticmethod
     def binary_search(arr, x):
         """
@@ -158,7 +284,7 @@ class SubsetSumSolver:
         """
         Ricostruisce la soluzione ottimale dalla matrice dp.
         
-        :param dp: Matrice delle decisioni per la Programmazione Dinamica.
+        :param dp: Matrice delle decisioni per la Programmazione Dinamica (BitMatrix o lista di liste).
         :param S: Lista degli elementi del set.
         :param T: Target da raggiungere.
         :return: Lista degli elementi che sommano al target.
@@ -175,3 +301,26 @@ class SubsetSumSolver:
                 T -= S[i - 1]
 
         return solution
+
+    @staticmethod
+    def find_solution_path(dp, S, T):
+        """
+        Restituisce il percorso seguito da find_solution nella matrice dp, cioè per ogni riga la colonna visitata durante
+        la ricostruzione della soluzione.
+
+        :param dp: Matrice delle decisioni per la Programmazione Dinamica (BitMatrix o lista di liste).
+        :param S: Lista degli elementi del set.
+        :param T: Target da raggiungere.
+        :return: Lista di n + 1 colonne indicizzata per riga, lista vuota se il target non è raggiungibile.
+        """
+        n = len(S)
+        if not dp[n][T]:
+            return []
+
+        path = [0] * (n + 1)
+        for i in range(n, 0, -1):
+            path[i] = T
+            if dp[i][T] and not dp[i - 1][T]:
+                T -= S[i - 1]
+        path[0] = T
+        return path
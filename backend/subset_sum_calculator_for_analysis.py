@@ -1,22 +1,126 @@
 from time import perf_counter
-from bisect import bisect_left
+import functools
+import heapq
+import multiprocessing
+import os
+import queue
+from multiprocessing import shared_memory
+import numpy as np
+from backend.algorithm_selector import AlgorithmSelector
+from backend.instance_reducer import InstanceReducer, reduced_engine
+from backend.reachability_index import ReachabilityIndex
+
+
+def anytime_engine(method):
+    """
+    Decoratore per i metodi calculate_* che aggiunge il parametro opzionale deadline (budget in secondi, di default quello
+    passato al costruttore). Durante l'esecuzione la scadenza assoluta è disponibile in self.deadline_at: quando viene
+    superata l'algoritmo si interrompe, imposta self.is_partial e restituisce il miglior sottoinsieme trovato con somma
+    al più T. Al termine self.gap contiene la distanza tra T e la somma della soluzione (None se l'istanza non ha soluzione),
+    nulla per gli algoritmi esatti e al più ε·T per quello approssimato.
+    Le chiamate annidate tra metodi decorati condividono la scadenza della chiamata esterna.
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, deadline=None, **kwargs):
+        if self.engine_depth > 0:
+            return method(self, *args, **kwargs)
+
+        budget = self.deadline if deadline is None else deadline
+        self.deadline_at = perf_counter() + budget if budget is not None else None
+        self.is_partial = False
+        self.approximation_ratio = None
+        self.engine_depth += 1
+        try:
+            result = method(self, *args, **kwargs)
+        finally:
+            self.engine_depth -= 1
+            self.deadline_at = None
+
+        solution = result[0]
+        if self.is_partial:
+            # Con il target complementato una soluzione parziale supererebbe T: si ripiega sull'insieme vuoto
+            if sum(solution) > self.original_T:
+                solution = []
+            self.gap = self.original_T - sum(solution)
+        else:
+            self.gap = self.original_T - sum(solution) if solution or self.original_T == 0 else None
+        return (solution,) + tuple(result[1:])
+    return wrapper
+
 
 class SubsetSumSolver:
     """
-    Questa classe implementa tre metodi diversi per risolvere il problema del subset sum: Programmazione Dinamica, 
-    Meet-in-the-Middle e Backtracking. Ciascun algoritmo è ottimizzato per situazioni diverse in termini di memoria e tempo.
+    Questa classe implementa diversi metodi per risolvere il problema del subset sum: Programmazione Dinamica (con set, bitset
+    e NumPy), Meet-in-the-Middle, Schroeppel-Shamir, Backtracking, l'algoritmo bilanciato di Pisinger e la costruzione
+    dell'insieme delle somme tramite convoluzioni FFT, anche in parallelo su più processi.
+    Ciascun algoritmo è ottimizzato per situazioni diverse in termini di memoria e tempo.
+    Tutti i metodi calculate_* accettano un parametro opzionale deadline (in secondi): allo scadere restituiscono il
+    miglior risultato parziale, segnalato dagli attributi is_partial e gap.
     """
 
-    def __init__(self, S, T):
+    # Numero di iterazioni tra due controlli della scadenza nei cicli più stretti
+    DEADLINE_CHECK_INTERVAL = 4096
+    # Numero massimo di somme del vettore più sparso per cui la convoluzione è calcolata per traslazioni invece che con la FFT
+    FFT_SHIFT_LIMIT = 32
+    # Memoria massima in byte delle bitmap delle somme visitate dal Backtracking, oltre la quale si usano set di interi
+    VISITED_BITSET_BYTES = 1 << 24
+    # Modulo dei conteggi modulari delle soluzioni (primo di Mersenne 2^61 - 1): le somme di due conteggi restano in int64
+    COUNT_MODULUS = 2 ** 61 - 1
+    # Errore relativo ammesso di default dall'algoritmo approssimato
+    DEFAULT_EPSILON = 0.01
+    # Intervallo in secondi tra due controlli dello stato dei processi del portfolio in attesa dei risultati
+    PORTFOLIO_POLL_INTERVAL = 0.1
+
+    # Motori usati dal portfolio, indicizzati con i nomi salvati nel database
+    ENGINES = {
+        'Dynamic Programming': 'calculate_dynamic_programming_bitset',
+        'Meet In The Middle': 'calculate_meet_in_the_middle',
+        'Backtracking': 'calculate_backtracking',
+    }
+    # Metodi eseguiti dai generatori di istanze per gli algoritmi dello storico: la modalità automatica esegue gli stessi,
+    # così che i tempi stimati dal selettore si riferiscano all'implementazione effettivamente eseguita
+    HISTORY_ENGINES = {
+        'Dynamic Programming': 'calculate_dynamic_programming',
+        'Meet In The Middle': 'calculate_meet_in_the_middle',
+        'Backtracking': 'calculate_backtracking',
+    }
+
+    def __init__(self, S, T, selector=None, reduce=True, deadline=None, epsilon=None, workers=None):
         """
         Inizializza la classe con il set S e il target T.
+        Se reduce è True l'istanza viene prima semplificata da InstanceReducer: tutti gli algoritmi lavorano sull'istanza
+        ridotta (self.S, self.T) e le soluzioni vengono riportate sugli elementi originali. Se è indicata una deadline
+        il target non viene complementato, così che i risultati parziali restino al di sotto di T.
         
         :param S: Lista di numeri interi che rappresentano il set.
         :param T: Somma target da raggiungere.
+        :param selector: AlgorithmSelector usato dalla modalità automatica (se None, quello condiviso addestrato sullo
+                         storico del database).
+        :param reduce: Se True applica le riduzioni condivise prima di ogni algoritmo.
+        :param deadline: Budget di tempo in secondi applicato di default a ogni algoritmo (opzionale).
+        :param epsilon: Errore relativo ammesso di default da calculate_fptas (se None si usa DEFAULT_EPSILON).
+        :param workers: Numero di processi usati di default dagli algoritmi paralleli (se None, uno per core).
         """
-        self.S = S
-        self.T = T
+        self.original_S = S
+        self.original_T = T
+        self.deadline = deadline
+        self.deadline_at = None
+        self.engine_depth = 0
+        self.is_partial = False
+        self.gap = None
+        self.epsilon = epsilon
+        self.approximation_ratio = None
+        self.workers = workers
+        self.reduction = InstanceReducer(S, T, allow_complement=deadline is None) if reduce else None
+        self.reduction_depth = 0
+        self.S = self.reduction.S if reduce else S
+        self.T = self.reduction.T if reduce else T
+        self.selector = selector
+        self.selected_algorithm = None
+        self.solution_count = None
     
+    @anytime_engine
+    @reduced_engine
     def calculate_dynamic_programming(self):
         """
         Risoluzione con Programmazione Dinamica utilizzando un approccio con set per ottimizzare memoria e tempo.
@@ -31,6 +135,10 @@ class SubsetSumSolver:
 
         start_time = perf_counter()
         for num in self.S:
+            if self.deadline_expired():
+                self.is_partial = True
+                execution_time = perf_counter() - start_time
+                return prev[max(reachable_sums)], execution_time
             new_sums = set()
             new_prev = {}
             for s in reachable_sums:
@@ -45,13 +153,171 @@ class SubsetSumSolver:
                 return prev[self.T], execution_time
         
         execution_time = perf_counter() - start_time
-        return [], execution_time   
-    
+        return [], execution_time
+
+    @anytime_engine
+    @reduced_engine
+    def calculate_dynamic_programming_bitset(self):
+        """
+        Risoluzione con Programmazione Dinamica su bitset, rappresentando le somme raggiungibili con un unico intero a precisione arbitraria.
+        Il bit s dell'intero vale 1 se la somma s è raggiungibile: l'aggiunta di un elemento x corrisponde a reach |= reach << x,
+        troncato ai T+1 bit meno significativi. L'algoritmo si ferma appena il bit T risulta impostato e ricostruisce la soluzione
+        confrontando gli stati del bitset memorizzati dopo ogni elemento.
+
+        :return: Lista degli elementi che sommano al target e il tempo di esecuzione.
+        """
+        start_time = perf_counter()
+        if self.T < 0:
+            return [], perf_counter() - start_time
+
+        mask = (1 << (self.T + 1)) - 1
+        target_bit = 1 << self.T
+        reach = 1
+        history = [reach]  # history[i] = bitset dopo i primi i elementi
+
+        for num in self.S:
+            if self.deadline_expired():
+                self.is_partial = True
+                break
+            if 0 < num <= self.T:
+                reach = (reach | (reach << num)) & mask
+            history.append(reach)
+            if reach & target_bit:
+                break
+
+        if reach & target_bit:
+            self.is_partial = False
+            target = self.T
+        elif self.is_partial:
+            target = reach.bit_length() - 1
+        else:
+            execution_time = perf_counter() - start_time
+            return [], execution_time
+
+        steps = self.trace_bitset_history(history, self.S, target)
+        solution = [self.S[i] for i in steps]
+        execution_time = perf_counter() - start_time
+        return solution, execution_time
+
+    @anytime_engine
+    @reduced_engine
+    def calculate_dynamic_programming_numpy(self):
+        """
+        Risoluzione con Programmazione Dinamica vettorializzata tramite NumPy.
+        Le somme raggiungibili sono memorizzate in un vettore booleano di lunghezza T+1, aggiornato per ogni elemento x
+        con un OR tra slice traslate di x posizioni. Per la ricostruzione si memorizza, in un array int32, l'indice del primo
+        elemento che ha reso raggiungibile ciascuna somma, evitando di copiare una lista per ogni nuova somma.
+
+        :return: Lista degli elementi che sommano al target e il tempo di esecuzione.
+        """
+        start_time = perf_counter()
+        if self.T < 0:
+            return [], perf_counter() - start_time
+
+        reachable = np.zeros(self.T + 1, dtype=np.bool_)
+        reachable[0] = True
+        first_index = np.full(self.T + 1, -1, dtype=np.int32)
+
+        for idx, num in enumerate(self.S):
+            if reachable[self.T]:
+                break
+            if self.deadline_expired():
+                self.is_partial = True
+                break
+            if num <= 0 or num > self.T:
+                continue
+            new_sums = reachable[:-num] > reachable[num:]
+            reachable[num:] |= new_sums
+            first_index[num:][new_sums] = idx
+
+        if reachable[self.T]:
+            self.is_partial = False
+            remaining = self.T
+        elif self.is_partial:
+            remaining = int(np.flatnonzero(reachable)[-1])
+        else:
+            execution_time = perf_counter() - start_time
+            return [], execution_time
+
+        solution = []
+        while remaining > 0:
+            num = self.S[first_index[remaining]]
+            solution.append(num)
+            remaining -= num
+
+        execution_time = perf_counter() - start_time
+        return solution[::-1], execution_time
+
+    @anytime_engine
+    @reduced_engine
+    def calculate_bounded_dynamic_programming(self):
+        """
+        Risoluzione con Programmazione Dinamica a molteplicità limitata, adatta ai set con molti valori ripetuti.
+        Invece di trattare ogni copia come un elemento indipendente, le m copie di un valore v vengono suddivise con lo
+        splitting binario in blocchi di 1, 2, 4, ... copie più un resto, così che ogni numero di copie tra 0 e m sia
+        ottenibile: il bitset delle somme raggiungibili viene aggiornato una volta per blocco, cioè O(log m) volte per valore.
+        La soluzione viene ricostruita individuando i blocchi utilizzati e quindi quante copie di ciascun valore servono.
+
+        :return: Lista degli elementi che sommano al target e il tempo di esecuzione.
+        """
+        start_time = perf_counter()
+        if self.T < 0:
+            return [], perf_counter() - start_time
+
+        if self.reduction is not None:
+            values, multiplicities = self.reduction.values, self.reduction.multiplicities
+        else:
+            values, multiplicities = InstanceReducer.group_duplicates(self.S)
+
+        mask = (1 << (self.T + 1)) - 1
+        target_bit = 1 << self.T
+        reach = 1
+        history = [reach]
+        blocks = []  # (valore, numero di copie) per ogni blocco dello splitting binario
+
+        for value, count in zip(values, multiplicities):
+            if value <= 0 or value > self.T:
+                continue
+            size = 1
+            while count > 0 and not reach & target_bit:
+                if self.deadline_expired():
+                    self.is_partial = True
+                    break
+                copies = min(size, count)
+                reach = (reach | (reach << (copies * value))) & mask
+                history.append(reach)
+                blocks.append((value, copies))
+                count -= copies
+                size <<= 1
+            if reach & target_bit or self.is_partial:
+                break
+
+        if reach & target_bit:
+            self.is_partial = False
+            target = self.T
+        elif self.is_partial:
+            target = reach.bit_length() - 1
+        else:
+            execution_time = perf_counter() - start_time
+            return [], execution_time
+
+        used = {}
+        for i in self.trace_bitset_history(history, [value * copies for value, copies in blocks], target):
+            value, copies = blocks[i]
+            used[value] = used.get(value, 0) + copies
+
+        solution = [value for value, copies in used.items() for _ in range(copies)]
+        execution_time = perf_counter() - start_time
+        return solution, execution_time
+
+    @anytime_engine
+    @reduced_engine
     def calculate_meet_in_the_middle(self):
         """
         Risoluzione con Meet-in-the-Middle, un algoritmo adatto per set di grandi dimensioni dividendo il problema in due metà più piccole.
-        La logica prevede di suddividere il set iniziale in due metà, calcolare tutte le possibili somme di sottoinsiemi per ciascuna metà, 
-        e cercare se combinando somme dalle due metà è possibile raggiungere il target.
+        La logica segue la variante di Horowitz-Sahni: per ciascuna metà la lista ordinata delle somme viene costruita fondendo,
+        per ogni elemento x, la lista corrente L con L + x (costo complessivo O(2^(n/2))). Ogni somma conserva una bitmask
+        degli indici utilizzati, e le due liste vengono confrontate con una scansione lineare a due puntatori.
         
         :return: Lista degli elementi che sommano al target e il tempo di esecuzione.
         """
@@ -60,36 +326,878 @@ class SubsetSumSolver:
         first_half = self.S[:mid]
         second_half = self.S[mid:]
 
-        def get_subset_sums(arr):
-            subset_sums = {}
-            n = len(arr)
-            for i in range(1 << n):
-                s = 0
-                subset = []
-                for j in range(n):
-                    if i & (1 << j):
-                        s += arr[j]
-                        subset.append(j)
-                if s <= self.T:
-                    subset_sums[s] = subset
-            return subset_sums
+        start_time = perf_counter()
+        first_sums, first_masks = self.get_sorted_subset_sums(first_half)
+        second_sums, second_masks = self.get_sorted_subset_sums(second_half)
+
+        i = 0
+        k = len(second_sums) - 1
+        best = None  # (somma, i, k) della migliore coppia con somma al più T
+        steps = 0
+        while i < len(first_sums) and k >= 0:
+            steps += 1
+            if steps % self.DEADLINE_CHECK_INTERVAL == 0 and self.deadline_expired():
+                self.is_partial = True
+                break
+            current = first_sums[i] + second_sums[k]
+            if current == self.T:
+                best = (current, i, k)
+                self.is_partial = False
+                break
+            if current < self.T:
+                if best is None or current > best[0]:
+                    best = (current, i, k)
+                i += 1
+            else:
+                k -= 1
+
+        if best is None or (best[0] != self.T and not self.is_partial):
+            execution_time = perf_counter() - start_time
+            return [], execution_time
+
+        _, i, k = best
+        first_indices = self.mask_to_indices(first_masks[i])
+        second_indices = self.mask_to_indices(second_masks[k])
+        solution = self.reconstruct_solution_from_indices(first_half, first_indices, second_half, second_indices)
+        execution_time = perf_counter() - start_time
+        return solution, execution_time
+
+    @anytime_engine
+    @reduced_engine
+    def calculate_schroeppel_shamir(self):
+        """
+        Risoluzione con l'algoritmo di Schroeppel-Shamir, una variante di Meet-in-the-Middle a basso consumo di memoria.
+        Il set viene suddiviso in quattro quarti A, B, C e D: le somme di A+B vengono generate in ordine crescente e quelle
+        di C+D in ordine decrescente tramite due heap, confrontandole con una scansione a due puntatori. In memoria restano
+        solo le liste dei quarti e gli heap, cioè O(2^(n/4)) elementi invece dei O(2^(n/2)) del Meet-in-the-Middle classico.
+
+        :return: Lista degli elementi che sommano al target e il tempo di esecuzione.
+        """
+        n = len(self.S)
+        bounds = [0, n // 4, n // 2, (3 * n) // 4, n]
+        quarters = [self.S[bounds[q]:bounds[q + 1]] for q in range(4)]
 
         start_time = perf_counter()
-        sum_first_half = get_subset_sums(first_half)
-        sum_second_half = get_subset_sums(second_half)
-        sum_second_half_keys = sorted(sum_second_half.keys())
+        (a_sums, a_masks), (b_sums, b_masks), (c_sums, c_masks), (d_sums, d_masks) = (
+            self.get_sorted_subset_sums(quarter) for quarter in quarters
+        )
+
+        # heap_low: somme A+B in ordine crescente, heap_high: somme C+D in ordine decrescente (chiavi negate)
+        bound = self.partial_sum_bound()
+        heap_low = [(a + b_sums[0], ia, 0) for ia, a in enumerate(a_sums) if a + b_sums[0] <= bound]
+        heap_high = [(-(c + d_sums[-1]), ic, len(d_sums) - 1) for ic, c in enumerate(c_sums)]
+        heapq.heapify(heap_low)
+        heapq.heapify(heap_high)
+
+        best = None  # (somma, indici nei quattro quarti) della migliore combinazione con somma al più T
+        steps = 0
+        while heap_low and heap_high:
+            steps += 1
+            if steps % self.DEADLINE_CHECK_INTERVAL == 0 and self.deadline_expired():
+                self.is_partial = True
+                break
+            low_sum, ia, ib = heap_low[0]
+            high_sum, ic, id_ = heap_high[0]
+            current = low_sum - high_sum
+            if current == self.T:
+                best = (current, (ia, ib, ic, id_))
+                self.is_partial = False
+                break
+            if current < self.T:
+                if best is None or current > best[0]:
+                    best = (current, (ia, ib, ic, id_))
+                heapq.heappop(heap_low)
+                if ib + 1 < len(b_sums) and a_sums[ia] + b_sums[ib + 1] <= bound:
+                    heapq.heappush(heap_low, (a_sums[ia] + b_sums[ib + 1], ia, ib + 1))
+            else:
+                heapq.heappop(heap_high)
+                if id_ > 0:
+                    heapq.heappush(heap_high, (-(c_sums[ic] + d_sums[id_ - 1]), ic, id_ - 1))
+
+        if best is None or (best[0] != self.T and not self.is_partial):
+            execution_time = perf_counter() - start_time
+            return [], execution_time
+
+        solution = []
+        for quarter, masks, index in zip(quarters, (a_masks, b_masks, c_masks, d_masks), best[1]):
+            solution.extend(quarter[j] for j in self.mask_to_indices(masks[index]))
         execution_time = perf_counter() - start_time
+        return solution, execution_time
 
-        for s in sum_first_half:
-            target = self.T - s
-            idx = bisect_left(sum_second_half_keys, target)
-            if idx < len(sum_second_half_keys) and sum_second_half_keys[idx] == target:
-                first_indices = sum_first_half[s]
-                second_indices = sum_second_half[target]
-                solution = self.reconstruct_solution_from_indices(first_half, first_indices, second_half, second_indices)
-                return solution, execution_time
+    @anytime_engine
+    @reduced_engine
+    def calculate_pisinger(self):
+        """
+        Risoluzione con l'algoritmo bilanciato di Pisinger (balsub), con complessità O(n * max(S)) indipendente dal target.
+        Si parte dalla soluzione di rottura, ottenuta inserendo gli elementi in ordine finché la somma non supera T, e si
+        considerano solo soluzioni bilanciate: si aggiunge un elemento quando la somma è al più T e se ne rimuove uno
+        quando la supera, per cui tutte le somme intermedie restano nell'intervallo (T - max(S), T + max(S)].
+        Per ogni somma μ si memorizza s(μ), il massimo indice tale che tutti gli elementi precedenti siano inclusi; per la
+        ricostruzione si registra, per ogni elemento aggiunto e ogni somma, l'operazione che ha prodotto il valore di s(μ).
 
-        return [], execution_time
+        :return: Lista degli elementi che sommano al target e il tempo di esecuzione.
+        """
+        start_time = perf_counter()
+        items = [x for x in self.S if 0 < x <= self.T]
+        total = sum(items)
+        if self.T <= 0 or total < self.T:
+            return [], perf_counter() - start_time
+        if total == self.T:
+            return items, perf_counter() - start_time
+
+        n = len(items)
+        w = [0] + items  # indici da 1 come nella formulazione originale
+        r = max(items)
+        c = self.T
+
+        b = 1
+        w_break = 0
+        while w_break + w[b] <= c:
+            w_break += w[b]
+            b += 1
+        if w_break == c:
+            return items[:b - 1], perf_counter() - start_time
+
+        # La posizione k corrisponde alla somma μ = c - r + 1 + k; per μ <= c il valore 0 indica assenza, per μ > c il valore 1
+        offset = c - r + 1
+        target_pos = c - offset
+        s_prev = [0] * r + [1] * r
+        s_prev[w_break - offset] = b
+        origins = []  # origins[t - b][k]: -1 copiato da t-1, -2 aggiunta di w_t, j > 0 rimozione di w_j
+
+        found_t = None
+        for t in range(b, n + 1):
+            if self.deadline_expired():
+                self.is_partial = True
+                break
+            wt = w[t]
+            s_cur = s_prev[:]
+            origin = [-1] * (2 * r)
+            for k in range(r):
+                value = s_prev[k]
+                if value > s_cur[k + wt]:
+                    s_cur[k + wt] = value
+                    origin[k + wt] = -2
+            for k in range(r - 1 + wt, r - 1, -1):
+                for j in range(s_prev[k], s_cur[k]):
+                    k2 = k - w[j]
+                    if j > s_cur[k2]:
+                        s_cur[k2] = j
+                        origin[k2] = j
+            origins.append(origin)
+            s_prev = s_cur
+            if s_cur[target_pos] > 0:
+                found_t = t
+                break
+
+        if found_t is not None:
+            t = found_t
+            k = target_pos
+        elif self.is_partial:
+            # Miglior somma al più T tra gli stati già calcolati (esiste sempre almeno la soluzione di rottura)
+            t = b - 1 + len(origins)
+            k = max(pos for pos in range(r) if s_prev[pos] > 0)
+        else:
+            return [], perf_counter() - start_time
+
+        included = [False] + [j < b for j in range(1, n + 1)]
+        while t >= b:
+            step = origins[t - b][k]
+            if step == -1:
+                t -= 1
+            elif step == -2:
+                included[t] = True
+                k -= w[t]
+                t -= 1
+            else:
+                included[step] = False
+                k += w[step]
+
+        solution = [w[j] for j in range(1, n + 1) if included[j]]
+        execution_time = perf_counter() - start_time
+        return solution, execution_time
+
+    @anytime_engine
+    @reduced_engine
+    def calculate_fft_sumset(self):
+        """
+        Risoluzione tramite la costruzione divide et impera dell'insieme delle somme dei sottoinsiemi.
+        Ogni elemento x è rappresentato dal vettore indicatore di {0, x}; i vettori vengono fusi a coppie, livello per
+        livello, con una convoluzione (moltiplicazione di polinomi) calcolata con la FFT di NumPy e troncata a T + 1, per un
+        costo complessivo di O(T log T log n) invece di O(n·T). Ogni nodo dell'albero conserva il proprio vettore compresso
+        in bit; il sottoinsieme testimone si ricostruisce scendendo dalla radice e cercando, in ogni nodo, come dividere la
+        somma richiesta tra i due figli.
+
+        :return: Lista degli elementi della soluzione e tempo di esecuzione.
+        """
+        start_time = perf_counter()
+        items = [x for x in self.S if 0 < x <= self.T]
+        if self.T <= 0 or not items:
+            execution_time = perf_counter() - start_time
+            return [], execution_time
+
+        # tree[d][i] = (vettore compresso, lunghezza, figli); al livello 0 i figli sono sostituiti dall'elemento
+        level = []
+        for x in items:
+            vector = np.zeros(x + 1, dtype=np.bool_)
+            vector[0] = vector[x] = True
+            level.append((np.packbits(vector), x + 1, x))
+        tree = [level]
+
+        while len(level) > 1:
+            if self.deadline_expired():
+                self.is_partial = True
+                break
+            next_level = []
+            for i in range(0, len(level) - 1, 2):
+                merged = self.convolve_sumsets(self.unpack_node(level[i]), self.unpack_node(level[i + 1]), self.T)
+                next_level.append((np.packbits(merged), len(merged), (i, i + 1)))
+            if len(level) % 2:
+                next_level.append(level[-1][:2] + ((len(level) - 1,),))
+            tree.append(next_level)
+            level = next_level
+
+        solution = self.descend_sumset_tree(tree, self.unpack_node, lambda node, target: [node[2]])
+        execution_time = perf_counter() - start_time
+        return solution, execution_time
+
+    @staticmethod
+    def unpack_node(node):
+        """
+        Decomprime il vettore indicatore di un nodo dell'albero usato da calculate_fft_sumset.
+
+        :param node: Tupla (vettore compresso con np.packbits, lunghezza, figli).
+        :return: Vettore booleano delle somme raggiungibili nel nodo.
+        """
+        return np.unpackbits(node[0], count=node[1]).astype(np.bool_)
+
+    @staticmethod
+    def split_sumset_target(left, right, target):
+        """
+        Divide una somma raggiungibile nell'unione di due insiemi disgiunti tra i due insiemi.
+
+        :param left: Vettore booleano delle somme raggiungibili con il primo insieme.
+        :param right: Vettore booleano delle somme raggiungibili con il secondo insieme.
+        :param target: Somma raggiungibile come a + b, con a nel primo insieme e b nel secondo.
+        :return: La parte a della somma da ottenere con il primo insieme.
+        """
+        low = max(0, target - len(right) + 1)
+        high = min(target, len(left) - 1)
+        hits = left[low:high + 1] & right[target - high:target - low + 1][::-1]
+        return low + int(np.flatnonzero(hits)[0])
+
+    @classmethod
+    def convolve_sumsets(cls, a, b, limit):
+        """
+        Calcola l'insieme delle somme a + b di due vettori indicatori, troncato a limit + 1 posizioni.
+        Se uno dei due vettori ha poche somme la convoluzione è calcolata per traslazioni, altrimenti con la FFT.
+
+        :param a: Vettore booleano delle somme del primo insieme.
+        :param b: Vettore booleano delle somme del secondo insieme.
+        :param limit: Somma massima da conservare.
+        :return: Vettore booleano delle somme raggiungibili.
+        """
+        size = min(len(a) + len(b) - 1, limit + 1)
+        if np.count_nonzero(a) < np.count_nonzero(b):
+            a, b = b, a
+        shifts = np.flatnonzero(b)
+        if len(shifts) <= cls.FFT_SHIFT_LIMIT:
+            result = np.zeros(size, dtype=np.bool_)
+            for shift in shifts:
+                if shift >= size:
+                    break
+                end = min(size, shift + len(a))
+                result[shift:end] |= a[:end - shift]
+            return result
+
+        fft_size = cls.next_fast_length(len(a) + len(b) - 1)
+        product = np.fft.irfft(np.fft.rfft(a, fft_size) * np.fft.rfft(b, fft_size), fft_size)
+        return product[:size] > 0.5
+
+    def descend_sumset_tree(self, tree, unpack, solve_leaf):
+        """
+        Ricostruisce un sottoinsieme testimone da un albero di fusioni di insiemi di somme, scendendo dalla radice e
+        dividendo in ogni nodo la somma richiesta tra i due figli. Se la costruzione è stata interrotta dalla scadenza si
+        parte dal nodo dell'ultimo livello completato con la somma più alta.
+
+        :param tree: Lista dei livelli; tree[d][i] = (dati, lunghezza, figli), dove al livello 0 i figli sono sostituiti
+                     dagli elementi della foglia e i nodi riportati senza fusione hanno un solo figlio.
+        :param unpack: Funzione che restituisce il vettore booleano delle somme di un nodo.
+        :param solve_leaf: Funzione (nodo foglia, somma) che restituisce gli elementi della foglia con quella somma.
+        :return: Lista degli elementi della soluzione, lista vuota se T non è raggiungibile.
+        """
+        if not tree:
+            return []
+        level = tree[-1]
+        if not self.is_partial:
+            root = unpack(level[0])
+            if len(root) <= self.T or not root[self.T]:
+                return []
+            index, target = 0, self.T
+        else:
+            target, index = max((int(np.flatnonzero(unpack(node))[-1]), i) for i, node in enumerate(level))
+
+        solution = []
+        stack = [(len(tree) - 1, index, target)]
+        while stack:
+            d, i, t = stack.pop()
+            if t == 0:
+                continue
+            if d == 0:
+                solution.extend(solve_leaf(tree[0][i], t))
+                continue
+            children = tree[d][i][2]
+            if len(children) == 1:
+                stack.append((d - 1, children[0], t))
+                continue
+            left = unpack(tree[d - 1][children[0]])
+            right = unpack(tree[d - 1][children[1]])
+            split = self.split_sumset_target(left, right, t)
+            stack.append((d - 1, children[0], split))
+            stack.append((d - 1, children[1], t - split))
+        return solution
+
+    @anytime_engine
+    @reduced_engine
+    def calculate_parallel_dynamic_programming(self, workers=None):
+        """
+        Programmazione Dinamica divide et impera su più processi. Il set viene diviso in k gruppi e ciascun processo calcola
+        con un bitset le somme raggiungibili (al più T) del proprio gruppo, scrivendole compresse in bit in un blocco di
+        memoria condivisa. I gruppi vengono poi fusi a coppie, sempre in parallelo, con una convoluzione OR (vedi
+        convolve_sumsets). Il testimone si ricostruisce scendendo dalla radice dell'albero delle fusioni; all'interno di
+        ciascun gruppo la Programmazione Dinamica viene ripetuta solo fino alla somma assegnata a quel gruppo.
+
+        :param workers: Numero di processi (di default quello passato al costruttore, altrimenti uno per core).
+        :return: Lista degli elementi della soluzione e tempo di esecuzione.
+        """
+        start_time = perf_counter()
+        items = [x for x in self.S if 0 < x <= self.T]
+        workers = min(workers or self.workers or os.cpu_count() or 1, len(items))
+        if workers <= 1:
+            return self.calculate_dynamic_programming_bitset()
+
+        chunks = [items[i::workers] for i in range(workers)]
+        blocks = []
+        tree = []  # tree[d][i] = (blocco di memoria condivisa, lunghezza, figli); al livello 0 i figli sono i gruppi
+        # I blocchi vengono creati prima del pool: così i processi condividono il resource tracker del processo principale,
+        # che è l'unico a rilasciarli
+        level = [(self.create_sumset_block(blocks, min(self.T, sum(chunk)) + 1), min(self.T, sum(chunk)) + 1, chunk)
+                 for chunk in chunks]
+        pool = multiprocessing.Pool(workers)
+        try:
+            tasks = [(chunk, block.name, length) for block, length, chunk in level]
+            if self.wait_pool_tasks(pool, SubsetSumSolver.run_chunk_dynamic_programming, tasks):
+                tree.append(level)
+
+            while tree and len(level) > 1:
+                next_level = []
+                tasks = []
+                for i in range(0, len(level) - 1, 2):
+                    (left, left_length, _), (right, right_length, _) = level[i], level[i + 1]
+                    length = min(self.T + 1, left_length + right_length - 1)
+                    block = self.create_sumset_block(blocks, length)
+                    next_level.append((block, length, (i, i + 1)))
+                    tasks.append((left.name, left_length, right.name, right_length, block.name, length))
+                if len(level) % 2:
+                    next_level.append(level[-1][:2] + ((len(level) - 1,),))
+                if not self.wait_pool_tasks(pool, SubsetSumSolver.run_sumset_merge, tasks):
+                    break
+                tree.append(next_level)
+                level = next_level
+        finally:
+            pool.terminate()
+            pool.join()
+
+        try:
+            solution = self.descend_sumset_tree(
+                tree,
+                lambda node: self.read_sumset_block(node[0], node[1]),
+                lambda node, target: self.solve_chunk_dynamic_programming(node[2], target)
+            )
+        finally:
+            for block in blocks:
+                block.close()
+                block.unlink()
+
+        execution_time = perf_counter() - start_time
+        return solution, execution_time
+
+    def remaining_time(self):
+        """
+        Calcola il tempo rimasto prima della scadenza dell'esecuzione corrente.
+
+        :return: Secondi rimasti (al minimo 0), None se non è stata impostata una scadenza.
+        """
+        if self.deadline_at is None:
+            return None
+        return max(0.0, self.deadline_at - perf_counter())
+
+    def wait_pool_tasks(self, pool, function, tasks):
+        """
+        Esegue un gruppo di compiti su un pool di processi e ne attende il completamento entro la scadenza.
+
+        :param pool: Pool di processi.
+        :param function: Funzione da eseguire, con gli argomenti di ciascun compito.
+        :param tasks: Lista delle tuple di argomenti.
+        :return: True se tutti i compiti sono terminati, False se la scadenza è stata superata (is_partial viene impostato).
+        """
+        result = pool.starmap_async(function, tasks)
+        result.wait(self.remaining_time())
+        if not result.ready():
+            self.is_partial = True
+            return False
+        result.get()
+        return True
+
+    @staticmethod
+    def create_sumset_block(blocks, length):
+        """
+        Crea un blocco di memoria condivisa per un vettore di length somme compresso in bit.
+
+        :param blocks: Lista dei blocchi creati, a cui viene aggiunto il nuovo blocco per il rilascio finale.
+        :param length: Numero di somme rappresentate.
+        :return: Il blocco di memoria condivisa.
+        """
+        block = shared_memory.SharedMemory(create=True, size=max(1, (length + 7) // 8))
+        blocks.append(block)
+        return block
+
+    @staticmethod
+    def read_sumset_block(block, length):
+        """
+        Legge un vettore di somme compresso in bit (un bit per somma, dal meno significativo) da un blocco condiviso.
+
+        :param block: Blocco di memoria condivisa.
+        :param length: Numero di somme rappresentate.
+        :return: Vettore booleano delle somme raggiungibili.
+        """
+        packed = np.frombuffer(block.buf, dtype=np.uint8, count=(length + 7) // 8)
+        vector = np.unpackbits(packed, count=length, bitorder='little').astype(np.bool_)
+        del packed
+        return vector
+
+    @staticmethod
+    def run_chunk_dynamic_programming(chunk, block_name, length):
+        """
+        Calcola in un processo del pool le somme raggiungibili di un gruppo di elementi e le scrive nel blocco condiviso.
+
+        :param chunk: Elementi del gruppo.
+        :param block_name: Nome del blocco di memoria condivisa di destinazione.
+        :param length: Numero di somme da rappresentare (somma massima + 1).
+        """
+        mask = (1 << length) - 1
+        reach = 1
+        for x in chunk:
+            reach = (reach | (reach << x)) & mask
+        data = reach.to_bytes((length + 7) // 8, 'little')
+        block = shared_memory.SharedMemory(name=block_name)
+        block.buf[:len(data)] = data
+        block.close()
+
+    @staticmethod
+    def run_sumset_merge(left_name, left_length, right_name, right_length, block_name, length):
+        """
+        Fonde in un processo del pool gli insiemi di somme di due nodi con una convoluzione OR e scrive il risultato nel
+        blocco condiviso di destinazione.
+
+        :param left_name: Nome del blocco del primo nodo.
+        :param left_length: Numero di somme del primo nodo.
+        :param right_name: Nome del blocco del secondo nodo.
+        :param right_length: Numero di somme del secondo nodo.
+        :param block_name: Nome del blocco di destinazione.
+        :param length: Numero di somme da rappresentare nel risultato.
+        """
+        vectors = []
+        for name, size in ((left_name, left_length), (right_name, right_length)):
+            block = shared_memory.SharedMemory(name=name)
+            vectors.append(SubsetSumSolver.read_sumset_block(block, size))
+            block.close()
+        merged = SubsetSumSolver.convolve_sumsets(vectors[0], vectors[1], length - 1)
+        data = np.packbits(merged, bitorder='little')
+        block = shared_memory.SharedMemory(name=block_name)
+        block.buf[:len(data)] = data.tobytes()
+        block.close()
+
+    def solve_chunk_dynamic_programming(self, chunk, target):
+        """
+        Trova gli elementi di un gruppo che sommano al target, con la Programmazione Dinamica su bitset limitata al target.
+
+        :param chunk: Elementi del gruppo.
+        :param target: Somma raggiungibile con gli elementi del gruppo.
+        :return: Lista degli elementi che sommano al target.
+        """
+        mask = (1 << (target + 1)) - 1
+        reach = 1
+        history = [reach]
+        for x in chunk:
+            reach = (reach | (reach << x)) & mask
+            history.append(reach)
+        return [chunk[i] for i in self.trace_bitset_history(history, chunk, target)]
+
+    @staticmethod
+    def next_fast_length(n):
+        """
+        Calcola la più piccola lunghezza maggiore o uguale a n della forma 2^a · 3^b · 5^c, per cui la FFT è più veloce
+        (rispetto alla potenza di 2 successiva si evita di quasi raddoppiare la dimensione dei vettori).
+
+        :param n: Lunghezza minima richiesta.
+        :return: Lunghezza scelta.
+        """
+        best = 1 << max(n - 1, 0).bit_length()
+        p5 = 1
+        while p5 < best:
+            p35 = p5
+            while p35 < best:
+                candidate = p35 << max((n - 1) // p35, 0).bit_length()
+                best = min(best, candidate)
+                p35 *= 3
+            p5 *= 5
+        return best
+
+    @anytime_engine
+    def calculate_fptas(self, epsilon=None):
+        """
+        Risolve in modo approssimato il problema con lo schema di approssimazione completamente polinomiale (FPTAS) a liste
+        sfoltite: per ogni elemento x la lista ordinata L delle somme viene fusa con L + x, scartando le somme maggiori di T
+        e, tra le somme che cadono nello stesso intervallo [(1 + δ)^k, (1 + δ)^(k+1)) con δ = ε / 2n, tutte tranne la minima.
+        La soluzione restituita ha somma compresa tra (1 - ε)·OPT e T, dove OPT è la massima somma di un sottoinsieme che
+        non supera T (quindi tra (1 - ε)·T e T se l'istanza ha soluzione esatta). Il costo è O(n² log T / ε), indipendente
+        dalla grandezza dei valori, e la ricerca si ferma non appena una somma raggiunge (1 - ε)·T.
+        Le liste sono vettori NumPy e per ogni somma mantenuta si conservano l'indice della somma da cui deriva e se x è
+        stato aggiunto, da cui si ricostruisce il sottoinsieme. La garanzia è registrata nell'attributo approximation_ratio.
+        Le riduzioni dell'istanza non vengono applicate: il complemento del target invertirebbe il verso dell'approssimazione.
+
+        :param epsilon: Errore relativo ammesso, compreso tra 0 e 1 (di default quello passato al costruttore).
+        :return: Lista degli elementi della soluzione approssimata e tempo di esecuzione.
+        """
+        start_time = perf_counter()
+        if epsilon is None:
+            epsilon = self.epsilon if self.epsilon is not None else self.DEFAULT_EPSILON
+        if not 0 < epsilon < 1:
+            raise ValueError("epsilon deve essere compreso tra 0 e 1")
+
+        T = self.original_T
+        # Gli elementi più grandi per primi: la soglia (1 - ε)·T viene raggiunta con meno fusioni
+        items = sorted((x for x in self.original_S if 0 < x <= T), reverse=True)
+        log_step = np.log1p(epsilon / (2 * max(len(items), 1)))
+        # Oltre il limite degli interi a 64 bit le somme vengono gestite come interi Python
+        dtype = np.int64 if T < 2 ** 62 else object
+
+        sums = np.zeros(1, dtype=dtype)
+        levels = []  # levels[j] = (indice di provenienza, elemento j aggiunto) per ogni somma mantenuta
+        for x in items:
+            if self.deadline_expired():
+                self.is_partial = True
+                break
+            size = len(sums)
+            fit = int(np.searchsorted(sums, T - x, side='right'))
+            candidates = np.concatenate((sums, sums[:fit] + x))
+            parents = np.concatenate((np.arange(size, dtype=np.int32), np.arange(fit, dtype=np.int32)))
+            added = np.concatenate((np.zeros(size, dtype=np.bool_), np.ones(fit, dtype=np.bool_)))
+
+            order = np.argsort(candidates, kind='stable')
+            candidates = candidates[order]
+            values = candidates.astype(np.float64)
+            buckets = np.where(values > 0, np.floor(np.log(np.maximum(values, 1.0)) / log_step), -1.0)
+            # Sfoltimento: di ogni intervallo si mantiene solo la somma minima
+            keep = np.ones(len(candidates), dtype=np.bool_)
+            keep[1:] = buckets[1:] != buckets[:-1]
+
+            sums = candidates[keep]
+            levels.append((parents[order][keep], added[order][keep]))
+            # Poiché OPT <= T, una somma di almeno (1 - ε)·T soddisfa già la garanzia
+            if sums[-1] >= (1 - epsilon) * T:
+                break
+
+        solution = []
+        position = len(sums) - 1
+        for j in range(len(levels) - 1, -1, -1):
+            parents, added = levels[j]
+            if added[position]:
+                solution.append(items[j])
+            position = parents[position]
+
+        self.approximation_ratio = 1 - epsilon
+        execution_time = perf_counter() - start_time
+        return solution[::-1], execution_time
+
+    @anytime_engine
+    @reduced_engine
+    def calculate_auto(self):
+        """
+        Risoluzione in modalità automatica: l'AlgorithmSelector sceglie, in base alle caratteristiche dell'istanza e allo
+        storico delle esecuzioni, quale tra Programmazione Dinamica, Meet-in-the-Middle e Backtracking eseguire.
+        Le caratteristiche sono calcolate sull'istanza originale, come quelle delle esecuzioni salvate nello storico, e
+        viene eseguita la stessa implementazione misurata dai generatori (HISTORY_ENGINES). Il tempo misurato viene poi
+        aggiunto al modello del selettore, e il nome dell'algoritmo scelto è disponibile nell'attributo selected_algorithm.
+
+        :return: Lista degli elementi che sommano al target e il tempo di esecuzione.
+        """
+        if self.selector is None:
+            self.selector = AlgorithmSelector.get_shared()
+
+        start_time = perf_counter()
+        algorithm = self.selector.select(self.original_S, self.original_T)
+        algorithm_method = getattr(self, self.HISTORY_ENGINES[algorithm])
+        selection_time = perf_counter() - start_time
+
+        solution, execution_time = algorithm_method()
+        if not self.is_partial:
+            self.selector.update(self.original_S, self.original_T, algorithm, execution_time)
+        self.selected_algorithm = algorithm
+        return solution, selection_time + execution_time
+
+    @anytime_engine
+    @reduced_engine
+    def calculate_portfolio(self, algorithms=None):
+        """
+        Risoluzione in modalità portfolio: Programmazione Dinamica, Meet-in-the-Middle e Backtracking vengono avviati
+        contemporaneamente in processi separati e viene restituita la prima risposta ottenuta, terminando gli altri processi.
+        In questo modo un'istanza patologica per un algoritmo non blocca la risoluzione. Il nome dell'algoritmo vincente
+        è disponibile nell'attributo selected_algorithm. Con una deadline, se nessun processo completa la ricerca in
+        tempo, viene restituito il migliore tra i risultati parziali. Un processo terminato senza inviare il risultato
+        (ad esempio perché ucciso per mancanza di memoria) viene considerato fallito, senza attenderlo.
+
+        :param algorithms: Nomi degli algoritmi da mettere in competizione (di default tutti quelli in ENGINES).
+        :return: Lista degli elementi che sommano al target e il tempo trascorso fino alla prima risposta.
+        :raises RuntimeError: Se tutti gli algoritmi falliscono.
+        """
+        algorithms = list(algorithms) if algorithms else list(self.ENGINES)
+        result_queue = multiprocessing.Queue()
+        start_time = perf_counter()
+        budget = None if self.deadline_at is None else max(0.0, self.deadline_at - start_time)
+        processes = [
+            multiprocessing.Process(
+                target=SubsetSumSolver.run_portfolio_engine,
+                args=(self.S, self.T, algorithm, self.ENGINES[algorithm], result_queue, budget),
+                daemon=True,
+            )
+            for algorithm in algorithms
+        ]
+        for process in processes:
+            process.start()
+
+        solution = []
+        self.selected_algorithm = None
+        best_partial = None
+        pending = dict(zip(algorithms, processes))
+        errors = []
+        try:
+            while pending:
+                try:
+                    algorithm, result, is_partial, error = result_queue.get(timeout=self.PORTFOLIO_POLL_INTERVAL)
+                except queue.Empty:
+                    # Un processo uscito correttamente ha già inviato il risultato, che arriverà al prossimo controllo
+                    for algorithm, process in list(pending.items()):
+                        if process.exitcode not in (None, 0):
+                            del pending[algorithm]
+                            errors.append(f"{algorithm}: processo terminato con codice {process.exitcode}")
+                    continue
+                del pending[algorithm]
+                if error is not None:
+                    errors.append(f"{algorithm}: {error}")
+                    continue
+                if not is_partial:
+                    solution = result
+                    self.selected_algorithm = algorithm
+                    break
+                if best_partial is None or sum(result) > sum(best_partial[1]):
+                    best_partial = (algorithm, result)
+            else:
+                if best_partial is not None:
+                    self.selected_algorithm, solution = best_partial
+                    self.is_partial = True
+                elif len(errors) == len(processes):
+                    raise RuntimeError("Tutti gli algoritmi del portfolio sono falliti (" + "; ".join(errors) + ")")
+        finally:
+            execution_time = perf_counter() - start_time
+            for process in processes:
+                if process.is_alive():
+                    process.terminate()
+            for process in processes:
+                process.join()
+            result_queue.close()
+
+        return solution, execution_time
+
+    @staticmethod
+    def run_portfolio_engine(S, T, algorithm, method_name, result_queue, deadline=None):
+        """
+        Esegue un singolo algoritmo all'interno di un processo del portfolio e invia il risultato sulla coda condivisa.
+
+        :param S: Lista di numeri interi che rappresentano il set.
+        :param T: Somma target da raggiungere.
+        :param algorithm: Nome dell'algoritmo, restituito insieme al risultato.
+        :param method_name: Nome del metodo calculate_* da eseguire.
+        :param result_queue: Coda su cui inviare la quaterna (algoritmo, soluzione, risultato parziale, errore).
+        :param deadline: Budget di tempo in secondi (opzionale).
+        """
+        try:
+            solver = SubsetSumSolver(S, T, deadline=deadline)
+            solution, _ = getattr(solver, method_name)()
+            result_queue.put((algorithm, solution, solver.is_partial, None))
+        except Exception as e:
+            result_queue.put((algorithm, None, False, str(e)))
+
+    def count_solutions(self, modulus=None, deadline=None):
+        """
+        Conta il numero di sottoinsiemi del set originale che sommano al target, con una Programmazione Dinamica
+        vettorializzata: per ogni elemento x il vettore dei conteggi viene aggiornato con counts[x:] += counts[:-x].
+        Senza modulo il conteggio è esatto e usa interi a precisione arbitraria (array NumPy di tipo object), con un modulo
+        usa array int64 e restituisce il conteggio modulo quel valore, molto più velocemente.
+        Il conteggio è calcolato sull'istanza ridotta (le riduzioni preservano il numero di soluzioni) e moltiplicato per
+        2^z, dove z è il numero di elementi nulli.
+
+        :param modulus: Modulo del conteggio (minore di 2^62), oppure None per il conteggio esatto.
+        :param deadline: Budget di tempo in secondi (opzionale): allo scadere il conteggio viene abbandonato.
+        :return: Numero di sottoinsiemi che sommano al target, oppure None se il set contiene elementi negativi o se
+                 il budget di tempo è scaduto.
+        """
+        deadline_at = perf_counter() + deadline if deadline is not None else None
+        if any(x < 0 for x in self.original_S):
+            return None
+        reduction = self.reduction
+        if reduction is None or reduction.is_trivial:
+            reduction = InstanceReducer(self.original_S, self.original_T, short_circuit=False)
+        if reduction.is_trivial:
+            self.solution_count = 0
+            return self.solution_count
+
+        if modulus is None:
+            counts = np.zeros(reduction.T + 1, dtype=object)
+        else:
+            counts = np.zeros(reduction.T + 1, dtype=np.int64)
+        counts[0] = 1
+        for num in reduction.S:
+            if deadline_at is not None and perf_counter() > deadline_at:
+                self.solution_count = None
+                return None
+            counts[num:] = counts[num:] + counts[:-num]
+            if modulus is not None:
+                counts[num:] %= modulus
+
+        if modulus is None:
+            self.solution_count = int(counts[reduction.T]) * 2 ** reduction.zeros
+        else:
+            self.solution_count = int(counts[reduction.T]) * pow(2, reduction.zeros, modulus) % modulus
+        return self.solution_count
+
+    def build_reachability_index(self, max_target=None):
+        """
+        Costruisce un ReachabilityIndex sul set originale, per interrogare molti target diversi senza ripetere il calcolo.
+
+        :param max_target: Target massimo interrogabile (di default la somma degli elementi positivi del set).
+        :return: Istanza di ReachabilityIndex.
+        """
+        return ReachabilityIndex(self.original_S, max_target)
+
+    def build_trivial_result(self, solution, execution_time):
+        """
+        Costruisce il risultato restituito dai metodi calculate_* quando l'istanza è risolta direttamente dalle riduzioni.
+
+        :param solution: Soluzione sugli elementi originali.
+        :param execution_time: Tempo impiegato dalle riduzioni.
+        :return: Lista degli elementi che sommano al target e il tempo di esecuzione.
+        """
+        return solution, execution_time
+
+    def deadline_expired(self):
+        """
+        Verifica se la scadenza dell'esecuzione corrente è stata superata.
+
+        :return: True se è stata impostata una scadenza e il tempo è esaurito, altrimenti False.
+        """
+        return self.deadline_at is not None and perf_counter() > self.deadline_at
+
+    @staticmethod
+    def trace_bitset_history(history, weights, target):
+        """
+        Ricostruisce quali passi di una Programmazione Dinamica su bitset sono stati usati per raggiungere una somma,
+        confrontando gli stati del bitset prima e dopo ciascun passo, a partire dall'ultimo.
+
+        :param history: Lista dei bitset, history[i] è lo stato dopo i primi i passi.
+        :param weights: Peso aggiunto a ogni passo.
+        :param target: Somma raggiungibile da ricostruire.
+        :return: Lista ordinata degli indici dei passi utilizzati.
+        """
+        steps = []
+        remaining = target
+        for i in range(len(history) - 1, 0, -1):
+            if remaining == 0:
+                break
+            if not (history[i - 1] >> remaining) & 1:
+                steps.append(i - 1)
+                remaining -= weights[i - 1]
+        return steps[::-1]
+
+    def partial_sum_bound(self):
+        """
+        Restituisce il limite oltre il quale una somma parziale può essere scartata: T se il set non contiene elementi
+        negativi, altrimenti nessun limite, perché gli elementi negativi possono riportare la somma al di sotto di T.
+
+        :return: Limite superiore delle somme parziali da conservare.
+        """
+        return self.T if all(x >= 0 for x in self.S) else float('inf')
+
+    def get_sorted_subset_sums(self, arr):
+        """
+        Calcola la lista ordinata delle somme dei sottoinsiemi di arr che non superano il target, fondendo per ogni elemento x
+        la lista corrente L con L + x. Ogni somma è accompagnata da una bitmask degli indici degli elementi utilizzati.
+        Se la scadenza viene superata si restituiscono le somme dei sottoinsiemi dei soli elementi già elaborati.
+
+        :param arr: Lista di elementi di cui calcolare le somme dei sottoinsiemi.
+        :return: Lista ordinata delle somme e lista parallela delle bitmask.
+        """
+        bound = self.partial_sum_bound()
+        sums = [0]
+        masks = [0]
+        for j, x in enumerate(arr):
+            if self.deadline_expired():
+                self.is_partial = True
+                break
+            bit = 1 << j
+            merged_sums = []
+            merged_masks = []
+            i = k = 0
+            size = len(sums)
+            while i < size and k < size:
+                shifted = sums[k] + x
+                if shifted > bound:
+                    break
+                if sums[i] <= shifted:
+                    merged_sums.append(sums[i])
+                    merged_masks.append(masks[i])
+                    i += 1
+                else:
+                    merged_sums.append(shifted)
+                    merged_masks.append(masks[k] | bit)
+                    k += 1
+            merged_sums.extend(sums[i:])
+            merged_masks.extend(masks[i:])
+            while k < size and sums[k] + x <= bound:
+                merged_sums.append(sums[k] + x)
+                merged_masks.append(masks[k] | bit)
+                k += 1
+            sums = merged_sums
+            masks = merged_masks
+        return sums, masks
+
+    @staticmethod
+    def mask_to_indices(mask):
+        """
+        Converte una bitmask nella lista degli indici dei bit impostati.
+
+        :param mask: Bitmask degli elementi selezionati.
+        :return: Lista degli indici corrispondenti.
+        """
+        indices = []
+        j = 0
+        while mask:
+            if mask & 1:
+                indices.append(j)
+            mask >>= 1
+            j += 1
+        return indices
 
     def reconstruct_solution_from_indices(self, first_half, first_indices, second_half, second_indices):
         """
@@ -101,44 +1209,103 @@ class SubsetSumSolver:
         second_combination = [second_half[i] for i in second_indices]
         return first_combination + second_combination
 
+    @anytime_engine
+    @reduced_engine
     def calculate_backtracking(self):
         """
         Risoluzione con Backtracking iterativo per evitare il rischio di overflow della pila di chiamate ricorsive.
         La logica dell'algoritmo consiste nel provare ogni combinazione possibile degli elementi del set in modo iterativo, 
         ma applicando tecniche di potatura come l'ordinamento decrescente e il calcolo delle somme cumulative per ridurre 
         il numero di esplorazioni non necessarie.
+        Il percorso corrente è memorizzato in liste preallocate di lunghezza n+1 (somma e ramo successivo per ogni livello,
+        il padre di un nodo è il livello precedente), senza copiare soluzioni parziali: il sottoinsieme viene ricostruito dal
+        percorso solo in caso di successo. Le somme già visitate a ciascun livello sono registrate in una bitmap di T + 1 bit
+        quando le bitmap di tutti i livelli occupano al più VISITED_BITSET_BYTES byte, altrimenti in un set di interi.
+        Il miglior percorso parziale viene conservato solo se è attiva una deadline.
         
         :return: Lista degli elementi che sommano al target e il tempo di esecuzione.
         """
         S_sorted = sorted(self.S, reverse=True)
         start_time = perf_counter()
-        memo = {}
-        stack = [(0, 0, [])]  # (indice, somma corrente, soluzione parziale)
-        found_solution = None
-        cumulative_sums = [0] * (len(S_sorted) + 1)
-        for i in range(len(S_sorted) - 1, -1, -1):
+        T = self.T
+        n = len(S_sorted)
+        cumulative_sums = [0] * (n + 1)
+        for i in range(n - 1, -1, -1):
             cumulative_sums[i] = cumulative_sums[i + 1] + S_sorted[i]
 
-        while stack:
-            i, current_sum, partial_solution = stack.pop()
+        # Liste e non array tipizzati: leggere un elemento di un array crea ogni volta un nuovo oggetto int
+        path_sum = [0] * (n + 1)
+        branch = bytearray(n + 1)  # 0 = nodo da espandere, 1 = prova l'esclusione, 2 = nodo esaurito
+        use_bitset = 0 <= T and (not S_sorted or S_sorted[-1] >= 0) and n * ((T >> 3) + 1) <= self.VISITED_BITSET_BYTES
+        if use_bitset:
+            visited = [bytearray((T >> 3) + 1) for _ in range(n)]
+        else:
+            visited = [set() for _ in range(n)]
 
-            if current_sum == self.T:
-                found_solution = partial_solution
-                break
+        track_best = self.deadline_at is not None
+        depth = 0
+        found = False
+        best_sum = 0
+        best_path = path_sum[:1]
+        steps = 0
+        while depth >= 0:
+            if track_best:
+                steps += 1
+                if steps % self.DEADLINE_CHECK_INTERVAL == 0 and self.deadline_expired():
+                    self.is_partial = True
+                    break
+            current_sum = path_sum[depth]
+            state = branch[depth]
 
-            if current_sum > self.T or i >= len(S_sorted):
-                continue
+            if state == 0:
+                if current_sum == T:
+                    found = True
+                    break
+                if track_best and current_sum > best_sum:
+                    best_sum = current_sum
+                    best_path = path_sum[:depth + 1]
+                if depth >= n or current_sum + cumulative_sums[depth] < T:
+                    depth -= 1
+                    continue
+                level_visited = visited[depth]
+                if use_bitset:
+                    # Con i tagli sopra, a questo punto 0 <= current_sum < T
+                    bit = 1 << (current_sum & 7)
+                    if level_visited[current_sum >> 3] & bit:
+                        depth -= 1
+                        continue
+                    level_visited[current_sum >> 3] |= bit
+                else:
+                    if current_sum in level_visited:
+                        depth -= 1
+                        continue
+                    level_visited.add(current_sum)
+                branch[depth] = 1
+                include_sum = current_sum + S_sorted[depth]
+                if include_sum <= T:
+                    depth += 1
+                    path_sum[depth] = include_sum
+                    branch[depth] = 0
+                    continue
+                state = 1
 
-            key = (i, current_sum)
-            if key in memo:
+            if state == 1:
+                branch[depth] = 2
+                depth += 1
+                path_sum[depth] = current_sum
+                branch[depth] = 0
                 continue
-            memo[key] = True
 
-            if current_sum + cumulative_sums[i] < self.T:
-                continue
+            depth -= 1
+
+        if not found:
+            path_sum = best_path if self.is_partial else path_sum[:1]
+            depth = len(path_sum) - 1
 
-            stack.append((i + 1, current_sum, partial_solution.copy()))
-            stack.append((i + 1, current_sum + S_sorted[i], partial_solution + [S_sorted[i]]))
+        solution = []
+        for level in range(depth):
+            if path_sum[level + 1] != path_sum[level]:
+                solution.append(S_sorted[level])
 
         execution_time = perf_counter() - start_time
-        return found_solution if found_solution is not None else [], execution_time
+        return solution, execution_time
@@ -0,0 +1,348 @@
+import functools
+import multiprocessing
+import os
+import queue
+import signal
+import sys
+import tkinter as tk
+from time import perf_counter
+from tkinter import ttk, messagebox
+from backend.result_cache import ResultCache
+
+def terminate_job(job_pid, signum, frame):
+    """
+    Gestore di SIGTERM del processo di lavoro. I processi figli (Portfolio, Programmazione Dinamica parallela, processi
+    di una campagna parallela) vengono terminati esplicitamente: altrimenti all'uscita il processo resterebbe in attesa
+    della chiusura del ProcessPoolExecutor, che attende le istanze in corso. Poi si esce con SystemExit, così che i
+    blocchi finally salvino i documenti ancora nel buffer.
+
+    :param job_pid: Pid del processo di lavoro.
+    :param signum: Numero del segnale ricevuto.
+    :param frame: Frame interrotto dal segnale.
+    """
+    if os.getpid() != job_pid:
+        # Gestore ereditato da un processo figlio creato con fork: un processo di un ProcessPoolExecutor tratterebbe
+        # SystemExit come l'errore di un'istanza e resterebbe attivo, per cui si ripristina il comportamento predefinito
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        os.kill(os.getpid(), signal.SIGTERM)
+        return
+    children = multiprocessing.active_children()
+    for child in children:
+        child.terminate()
+    for child in children:
+        child.join()
+    sys.exit(1)
+
+
+def run_job(result_queue, target, args, kwargs):
+    """
+    Funzione eseguita nel processo di lavoro: chiama target passando una funzione di avanzamento e invia al processo
+    della GUI i messaggi ('progress', completati, totale, messaggio), poi ('done', risultato) oppure ('error', messaggio).
+
+    :param result_queue: Coda verso il processo della GUI.
+    :param target: Funzione da eseguire, deve accettare il parametro progress.
+    :param args: Argomenti posizionali di target.
+    :param kwargs: Argomenti con nome di target.
+    """
+    # All'annullamento il processo riceve SIGTERM
+    signal.signal(signal.SIGTERM, functools.partial(terminate_job, os.getpid()))
+
+    def progress(done, total, message=""):
+        result_queue.put(('progress', done, total, message))
+
+    try:
+        result = target(*args, progress=progress, **kwargs)
+    except Exception as e:
+        result_queue.put(('error', f"{type(e).__name__}: {e}"))
+    else:
+        result_queue.put(('done', result))
+
+
+def run_generator(generator_class, args=(), kwargs=None, use_result_cache=False, progress=None):
+    """
+    Esegue una campagna di generazione nel processo di lavoro; i risultati vengono salvati dai gestori del database
+    del generatore, come nell'esecuzione diretta.
+
+    :param generator_class: Classe del generatore (SubsetInstanceGeneratorWithS o SubsetInstanceGenerator).
+    :param args: Argomenti posizionali del costruttore.
+    :param kwargs: Argomenti con nome del costruttore.
+    :param use_result_cache: Se True il generatore usa una ResultCache creata nel processo di lavoro (la connessione
+                             al database non può essere condivisa tra processi).
+    :param progress: Funzione di avanzamento passata a run_subset_sum_algorithms.
+    :return: Numero di documenti salvati nel database.
+    """
+    kwargs = dict(kwargs or {})
+    result_cache = ResultCache() if use_result_cache else None
+    if result_cache is not None:
+        kwargs['result_cache'] = result_cache
+    try:
+        return generator_class(*args, **kwargs).run_subset_sum_algorithms(progress=progress)
+    finally:
+        if result_cache is not None:
+            result_cache.close()
+
+
+class BackgroundJobRunner:
+    """
+    Questa classe esegue un'operazione pesante in un processo separato, così che il ciclo principale di Tk resti reattivo.
+    Il processo comunica con la GUI attraverso una coda, che viene controllata periodicamente con after(); l'annullamento
+    termina il processo, per cui l'operazione si ferma davvero anche se è bloccata all'interno di un algoritmo.
+    Il processo non è daemon, perché alcuni algoritmi (Portfolio, Programmazione Dinamica parallela) creano a loro volta
+    dei processi figli.
+    """
+
+    # Intervallo in millisecondi tra due controlli della coda
+    POLL_INTERVAL = 100
+    # Attesa massima in secondi per i messaggi ancora in transito quando il processo è già terminato
+    FINAL_MESSAGE_TIMEOUT = 1.0
+    # Attesa massima in secondi della chiusura del processo di lavoro, dopo la quale viene ucciso con SIGKILL
+    JOIN_TIMEOUT = 5.0
+
+    def __init__(self, master):
+        """
+        Inizializza il runner.
+
+        :param master: Widget Tk usato per pianificare i controlli con after().
+        """
+        self.master = master
+        self.process = None
+        self.result_queue = None
+        self.poll_id = None
+        self.start_time = None
+        self.callbacks = {}
+        self.progress_state = (0, None, "")
+
+    @property
+    def is_running(self):
+        """
+        Indica se un'operazione è in corso.
+        """
+        return self.process is not None
+
+    def elapsed(self):
+        """
+        Restituisce i secondi trascorsi dall'avvio dell'operazione in corso.
+        """
+        return perf_counter() - self.start_time if self.start_time is not None else 0.0
+
+    def start(self, target, args=(), kwargs=None, on_done=None, on_error=None, on_status=None, on_cancel=None):
+        """
+        Avvia un'operazione in un nuovo processo.
+
+        :param target: Funzione da eseguire (definita a livello di modulo), deve accettare il parametro progress.
+        :param args: Argomenti posizionali di target.
+        :param kwargs: Argomenti con nome di target.
+        :param on_done: Chiamata con il risultato di target al termine dell'operazione.
+        :param on_error: Chiamata con il messaggio di errore se target solleva un'eccezione o il processo termina
+                         inaspettatamente.
+        :param on_status: Chiamata a ogni controllo con secondi trascorsi, elementi completati, totale (None se non noto)
+                          e ultimo messaggio di avanzamento.
+        :param on_cancel: Chiamata dopo l'annullamento dell'operazione.
+        :raises RuntimeError: Se un'altra operazione è già in corso.
+        """
+        if self.is_running:
+            raise RuntimeError("Un'altra operazione è già in esecuzione")
+        self.callbacks = {'done': on_done, 'error': on_error, 'status': on_status, 'cancel': on_cancel}
+        self.progress_state = (0, None, "")
+        self.result_queue = multiprocessing.Queue()
+        self.process = multiprocessing.Process(target=run_job, args=(self.result_queue, target, args, kwargs or {}))
+        self.start_time = perf_counter()
+        self.process.start()
+        self.poll_id = self.master.after(self.POLL_INTERVAL, self.poll)
+
+    def poll(self):
+        """
+        Legge i messaggi arrivati dal processo di lavoro e, se l'operazione non è terminata, pianifica il controllo
+        successivo.
+        """
+        self.poll_id = None
+        try:
+            while True:
+                if self.handle_message(self.result_queue.get_nowait()):
+                    return
+        except queue.Empty:
+            pass
+
+        if not self.process.is_alive():
+            # Il risultato può essere ancora in transito nella coda anche se il processo è già uscito
+            try:
+                while True:
+                    if self.handle_message(self.result_queue.get(timeout=self.FINAL_MESSAGE_TIMEOUT)):
+                        return
+            except queue.Empty:
+                self.finish('error', f"Il processo di lavoro è terminato inaspettatamente (codice {self.process.exitcode})")
+                return
+
+        self.notify_status()
+        self.poll_id = self.master.after(self.POLL_INTERVAL, self.poll)
+
+    def handle_message(self, message):
+        """
+        Gestisce un messaggio del processo di lavoro.
+
+        :param message: Tupla il cui primo elemento è il tipo del messaggio ('progress', 'done' o 'error').
+        :return: True se il messaggio conclude l'operazione, altrimenti False.
+        """
+        kind = message[0]
+        if kind == 'progress':
+            self.progress_state = message[1:]
+            return False
+        self.finish(kind, message[1])
+        return True
+
+    def notify_status(self):
+        """
+        Comunica alla GUI lo stato di avanzamento corrente.
+        """
+        if self.callbacks.get('status'):
+            done, total, message = self.progress_state
+            self.callbacks['status'](self.elapsed(), done, total, message)
+
+    def finish(self, kind, payload):
+        """
+        Chiude l'operazione corrente e chiama la callback corrispondente all'esito.
+
+        :param kind: 'done', 'error' o 'cancel'.
+        :param payload: Risultato, messaggio di errore o None.
+        """
+        if self.poll_id is not None:
+            self.master.after_cancel(self.poll_id)
+            self.poll_id = None
+        if kind == 'cancel':
+            self.process.terminate()
+        # Il processo può restare bloccato in codice che non gestisce il segnale: la GUI non deve attenderlo all'infinito
+        self.process.join(self.JOIN_TIMEOUT)
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join()
+        self.result_queue.close()
+        self.process = None
+        self.result_queue = None
+        self.start_time = None
+
+        callback = self.callbacks.get(kind)
+        self.callbacks = {}
+        if callback is not None:
+            if kind == 'cancel':
+                callback()
+            else:
+                callback(payload)
+
+    def cancel(self):
+        """
+        Annulla l'operazione in corso terminando il processo di lavoro; i risultati già salvati nel database restano.
+        """
+        if self.is_running:
+            self.finish('cancel', None)
+
+
+class JobStatusBar:
+    """
+    Barra di stato per le operazioni eseguite da un BackgroundJobRunner: mostra una barra di avanzamento (indeterminata se
+    il totale non è noto), il tempo trascorso e un pulsante per annullare l'operazione. Durante l'esecuzione disabilita
+    i controlli indicati, per evitare di avviare due operazioni contemporaneamente.
+    """
+
+    def __init__(self, master, bg="#f0f0f5"):
+        """
+        Crea i widget della barra di stato.
+
+        :param master: Widget contenitore.
+        :param bg: Colore di sfondo.
+        """
+        self.runner = BackgroundJobRunner(master)
+        self.frame = tk.Frame(master, bg=bg)
+        self.progressbar = ttk.Progressbar(self.frame, orient=tk.HORIZONTAL, length=300, mode="determinate")
+        self.progressbar.pack(side=tk.LEFT, padx=5)
+        self.status_label = tk.Label(self.frame, text="Pronto", bg=bg, font=("Arial", 12), width=45, anchor="w")
+        self.status_label.pack(side=tk.LEFT, padx=5)
+        self.cancel_button = tk.Button(self.frame, text="Annulla", command=self.runner.cancel, state=tk.DISABLED,
+                                       bg="#FF4C4C", fg="white", font=("Arial", 12, "bold"))
+        self.cancel_button.pack(side=tk.LEFT, padx=5)
+        self.controls = []
+        self.description = ""
+
+    def grid(self, **kwargs):
+        """
+        Posiziona la barra di stato nel contenitore con il gestore grid.
+        """
+        self.frame.grid(**kwargs)
+
+    def run(self, description, target, args=(), kwargs=None, on_done=None, controls=()):
+        """
+        Avvia un'operazione in background e ne mostra l'avanzamento.
+
+        :param description: Descrizione dell'operazione mostrata nella barra.
+        :param target: Funzione da eseguire nel processo di lavoro, deve accettare il parametro progress.
+        :param args: Argomenti posizionali di target.
+        :param kwargs: Argomenti con nome di target.
+        :param on_done: Chiamata con il risultato di target al termine dell'operazione.
+        :param controls: Widget da disabilitare durante l'esecuzione.
+        :return: True se l'operazione è stata avviata, False se un'altra era già in corso.
+        """
+        if self.runner.is_running:
+            messagebox.showwarning("Operazione in corso", "Attendi il termine dell'operazione in corso o annullala.")
+            return False
+        self.description = description
+        self.controls = list(controls)
+        for control in self.controls:
+            control.config(state=tk.DISABLED)
+        self.cancel_button.config(state=tk.NORMAL)
+        self.progressbar.config(mode="indeterminate")
+        self.progressbar.start(20)
+        self.status_label.config(text=f"{description}...")
+
+        def done(result):
+            self.reset("Completato")
+            if on_done is not None:
+                on_done(result)
+
+        def error(message):
+            self.reset("Errore")
+            messagebox.showerror("Errore", message)
+
+        self.runner.start(target, args, kwargs, on_done=done, on_error=error, on_status=self.update_status,
+                          on_cancel=lambda: self.reset("Operazione annullata"))
+        return True
+
+    def update_status(self, elapsed, done, total, message):
+        """
+        Aggiorna barra e testo con lo stato ricevuto dal runner.
+
+        :param elapsed: Secondi trascorsi dall'avvio.
+        :param done: Elementi completati.
+        :param total: Totale degli elementi, None se non noto.
+        :param message: Ultimo messaggio di avanzamento.
+        """
+        text = f"{self.description}: {elapsed:.1f} s"
+        if total:
+            if str(self.progressbar.cget("mode")) != "determinate":
+                self.progressbar.stop()
+                self.progressbar.config(mode="determinate", maximum=total)
+            self.progressbar.config(value=done)
+            text += f", {done}/{total}"
+        if message:
+            text += f" ({message})"
+        self.status_label.config(text=text)
+
+    def reset(self, text):
+        """
+        Riporta la barra di stato a riposo e riabilita i controlli.
+
+        :param text: Testo finale mostrato nella barra.
+        """
+        self.progressbar.stop()
+        self.progressbar.config(mode="determinate", value=0)
+        self.cancel_button.config(state=tk.DISABLED)
+        self.status_label.config(text=text)
+        for control in self.controls:
+            # Il widget può essere stato distrutto durante l'esecuzione (ad esempio ricreando un form)
+            if control.winfo_exists():
+                control.config(state=tk.NORMAL)
+        self.controls = []
+
+    def cancel(self):
+        """
+        Annulla l'operazione in corso, se presente.
+        """
+        self.runner.cancel()
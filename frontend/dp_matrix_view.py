@@ -0,0 +1,215 @@
+import tkinter as tk
+
+class DPMatrixView:
+    """
+    Visualizzazione della matrice dp su un unico tk.Canvas virtualizzato: a ogni ridisegno vengono disegnate solo le celle
+    che rientrano nella finestra visibile, per cui il costo dipende dalle dimensioni dello schermo e non da quelle
+    dell'istanza. La vista si sposta con le barre di scorrimento o con la rotella del mouse (Shift per lo scorrimento
+    orizzontale), si ingrandisce con Ctrl + rotella o con i pulsanti di zoom ed evidenzia il percorso di ricostruzione
+    della soluzione.
+    """
+
+    MIN_CELL_SIZE = 4
+    MAX_CELL_SIZE = 60
+    ZOOM_FACTOR = 1.25
+    # Sotto questa dimensione le celle sono troppo piccole per contenere il testo
+    TEXT_CELL_SIZE = 18
+    HEADER_COLOR = "#007bff"
+    TRUE_COLOR = "lightgreen"
+    FALSE_COLOR = "salmon"
+    PATH_COLOR = "#1A5276"
+
+    def __init__(self, master, width=1000, height=360):
+        """
+        Crea il canvas e le barre di scorrimento.
+
+        :param master: Widget contenitore.
+        :param width: Larghezza iniziale del canvas in pixel.
+        :param height: Altezza iniziale del canvas in pixel.
+        """
+        self.frame = tk.Frame(master, bg="#f0f0f5")
+        self.canvas = tk.Canvas(self.frame, width=width, height=height, bg="#f0f0f5", highlightthickness=0)
+        self.vertical_scrollbar = tk.Scrollbar(self.frame, orient=tk.VERTICAL, command=self.scroll_rows)
+        self.horizontal_scrollbar = tk.Scrollbar(self.frame, orient=tk.HORIZONTAL, command=self.scroll_columns)
+        self.canvas.grid(row=0, column=0, sticky="nsew")
+        self.vertical_scrollbar.grid(row=0, column=1, sticky="ns")
+        self.horizontal_scrollbar.grid(row=1, column=0, sticky="ew")
+        self.zoom_frame = tk.Frame(self.frame, bg="#f0f0f5")
+        self.zoom_frame.grid(row=2, column=0, columnspan=2, pady=2)
+        tk.Button(self.zoom_frame, text="Zoom +", command=lambda: self.zoom(self.ZOOM_FACTOR), font=("Arial", 10)).pack(side=tk.LEFT, padx=5)
+        tk.Button(self.zoom_frame, text="Zoom -", command=lambda: self.zoom(1 / self.ZOOM_FACTOR), font=("Arial", 10)).pack(side=tk.LEFT, padx=5)
+        self.frame.grid_rowconfigure(0, weight=1)
+        self.frame.grid_columnconfigure(0, weight=1)
+
+        self.canvas.bind("<Configure>", lambda event: self.redraw())
+        self.canvas.bind("<MouseWheel>", lambda event: self.scroll_rows("scroll", -1 if event.delta > 0 else 1, "units"))
+        self.canvas.bind("<Shift-MouseWheel>", lambda event: self.scroll_columns("scroll", -1 if event.delta > 0 else 1, "units"))
+        self.canvas.bind("<Control-MouseWheel>", lambda event: self.zoom(self.ZOOM_FACTOR if event.delta > 0 else 1 / self.ZOOM_FACTOR))
+        # Su Linux la rotella genera gli eventi dei pulsanti 4 e 5
+        self.canvas.bind("<Button-4>", lambda event: self.scroll_rows("scroll", -1, "units"))
+        self.canvas.bind("<Button-5>", lambda event: self.scroll_rows("scroll", 1, "units"))
+        self.canvas.bind("<Control-Button-4>", lambda event: self.zoom(self.ZOOM_FACTOR))
+        self.canvas.bind("<Control-Button-5>", lambda event: self.zoom(1 / self.ZOOM_FACTOR))
+
+        self.dp = None
+        self.S = []
+        self.T = 0
+        self.path = []
+        self.cell_size = 40
+        self.row_offset = 0
+        self.column_offset = 0
+
+    def pack(self, **kwargs):
+        """
+        Posiziona la vista nel contenitore con il gestore pack.
+        """
+        self.frame.pack(**kwargs)
+
+    def show(self, dp, S, T, path=None):
+        """
+        Mostra una nuova matrice dp a partire dall'angolo in alto a sinistra.
+
+        :param dp: Matrice dp (BitMatrix o lista di liste) con len(S) + 1 righe e T + 1 colonne.
+        :param S: Elementi del set corrispondenti alle righe 1..len(S).
+        :param T: Target, ultima colonna della matrice.
+        :param path: Per ogni riga, la colonna attraversata dal percorso di ricostruzione della soluzione
+                     (lista vuota se non c'è soluzione).
+        """
+        self.dp = dp
+        self.S = S
+        self.T = T
+        self.path = path or []
+        self.row_offset = 0
+        self.column_offset = 0
+        self.redraw()
+
+    def clear(self):
+        """
+        Rimuove la matrice mostrata.
+        """
+        self.dp = None
+        self.redraw()
+
+    def visible_rows(self):
+        """
+        Numero di righe della matrice che entrano nell'area visibile, esclusa l'intestazione.
+        """
+        return max(1, (self.canvas.winfo_height() - self.cell_size) // self.cell_size)
+
+    def visible_columns(self):
+        """
+        Numero di colonne della matrice che entrano nell'area visibile, esclusa l'intestazione.
+        """
+        return max(1, (self.canvas.winfo_width() - self.cell_size) // self.cell_size)
+
+    def redraw(self):
+        """
+        Ridisegna la finestra visibile della matrice e aggiorna le barre di scorrimento.
+        """
+        canvas = self.canvas
+        canvas.delete("all")
+        if self.dp is None:
+            self.vertical_scrollbar.set(0.0, 1.0)
+            self.horizontal_scrollbar.set(0.0, 1.0)
+            return
+
+        size = self.cell_size
+        total_rows, total_columns = len(self.S), self.T + 1
+        first_row, first_column = self.row_offset, self.column_offset
+        last_row = min(total_rows, first_row + self.visible_rows())
+        last_column = min(total_columns, first_column + self.visible_columns())
+        show_text = size >= self.TEXT_CELL_SIZE
+        font = ("Arial", max(6, size // 4))
+
+        canvas.create_rectangle(0, 0, size, size, fill=self.HEADER_COLOR, outline="white")
+        if show_text:
+            canvas.create_text(size / 2, size / 2, text="S \\ T", fill="white", font=font)
+        for j in range(first_column, last_column):
+            x = (j - first_column + 1) * size
+            canvas.create_rectangle(x, 0, x + size, size, fill=self.HEADER_COLOR, outline="white")
+            if show_text:
+                canvas.create_text(x + size / 2, size / 2, text=str(j), fill="white", font=font)
+
+        # Le righe della matrice partono da 1, come nella vista a tabella: la riga 0 (insieme vuoto) è implicita
+        for i in range(first_row + 1, last_row + 1):
+            y = (i - first_row) * size
+            canvas.create_rectangle(0, y, size, y + size, fill=self.HEADER_COLOR, outline="white")
+            if show_text:
+                canvas.create_text(size / 2, y + size / 2, text=str(self.S[i - 1]), fill="white", font=font)
+            row = self.dp[i]
+            path_column = self.path[i] if i < len(self.path) else None
+            for j in range(first_column, last_column):
+                x = (j - first_column + 1) * size
+                value = row[j]
+                canvas.create_rectangle(x, y, x + size, y + size, fill=self.TRUE_COLOR if value else self.FALSE_COLOR, outline="white")
+                if show_text:
+                    canvas.create_text(x + size / 2, y + size / 2, text="1" if value else "0", font=font)
+            if path_column is not None and first_column <= path_column < last_column:
+                x = (path_column - first_column + 1) * size
+                canvas.create_rectangle(x + 1, y + 1, x + size - 1, y + size - 1, outline=self.PATH_COLOR, width=3)
+
+        self.vertical_scrollbar.set(*self.scrollbar_fractions(first_row, last_row, total_rows))
+        self.horizontal_scrollbar.set(*self.scrollbar_fractions(first_column, last_column, total_columns))
+
+    @staticmethod
+    def scrollbar_fractions(first, last, total):
+        """
+        Calcola la porzione visibile nel formato richiesto da tk.Scrollbar.set.
+
+        :param first: Primo indice visibile.
+        :param last: Indice successivo all'ultimo visibile.
+        :param total: Numero totale di indici.
+        :return: Frazioni iniziale e finale.
+        """
+        if not total:
+            return 0.0, 1.0
+        return first / total, last / total
+
+    @staticmethod
+    def scrolled_offset(offset, visible, total, action, amount, unit=None):
+        """
+        Calcola il nuovo indice iniziale secondo il protocollo dei comandi di tk.Scrollbar.
+
+        :param offset: Indice iniziale corrente.
+        :param visible: Numero di indici visibili.
+        :param total: Numero totale di indici.
+        :param action: "moveto" (posizione frazionaria) oppure "scroll" (spostamento relativo).
+        :param amount: Frazione per "moveto", numero di unità o pagine per "scroll".
+        :param unit: "units" o "pages" per "scroll".
+        :return: Nuovo indice iniziale.
+        """
+        if action == "moveto":
+            offset = int(float(amount) * total)
+        else:
+            offset += int(amount) * (visible if unit == "pages" else 1)
+        return max(0, min(offset, total - visible))
+
+    def scroll_rows(self, action, amount, unit=None):
+        """
+        Scorre la vista in verticale (comando della barra di scorrimento verticale).
+        """
+        if self.dp is None:
+            return
+        self.row_offset = self.scrolled_offset(self.row_offset, self.visible_rows(), len(self.S), action, amount, unit)
+        self.redraw()
+
+    def scroll_columns(self, action, amount, unit=None):
+        """
+        Scorre la vista in orizzontale (comando della barra di scorrimento orizzontale).
+        """
+        if self.dp is None:
+            return
+        self.column_offset = self.scrolled_offset(self.column_offset, self.visible_columns(), self.T + 1, action, amount, unit)
+        self.redraw()
+
+    def zoom(self, factor):
+        """
+        Cambia la dimensione delle celle, entro i limiti MIN_CELL_SIZE e MAX_CELL_SIZE.
+
+        :param factor: Fattore moltiplicativo della dimensione delle celle.
+        """
+        self.cell_size = int(max(self.MIN_CELL_SIZE, min(self.MAX_CELL_SIZE, round(self.cell_size * factor))))
+        if self.dp is not None:
+            self.row_offset = max(0, min(self.row_offset, len(self.S) - self.visible_rows()))
+            self.column_offset = max(0, min(self.column_offset, self.T + 1 - self.visible_columns()))
+        self.redraw()
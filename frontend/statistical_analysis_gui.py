@@ -7,6 +7,7 @@ from backend.instance_generator_dense_sparse import SubsetInstanceGenerator
 from backend.algorithm_efficiency_analyzer import AlgorithmEfficiencyAnalyzer
 from backend.dense_sparse_DB_handler import DenseSparseDBHandler 
 from backend.report_generator import ReportGenerator
+from frontend.background_job_runner import JobStatusBar, run_generator
 
 class StatisticalAnalysisGUI:
     
@@ -61,6 +62,11 @@ class StatisticalAnalysisGUI:
         self.next_button.grid_remove()  # Nasconde il pulsante inizialmente
 
         self.input_frame = tk.Frame(self.frame, bg="#F8F9FA", bd=2, relief=tk.RAISED)
+
+        # Stato della generazione in background, con il pulsante per annullarla
+        self.job_status = JobStatusBar(self.frame, bg="#FFFFFF")
+        self.job_status.grid(row=6, column=0, columnspan=2, padx=10, pady=5)
+        master.protocol("WM_DELETE_WINDOW", self.on_close)
         
         self.frame.grid_rowconfigure(3, weight=1)
         self.frame.grid_columnconfigure(0, weight=1)
@@ -100,7 +106,9 @@ class StatisticalAnalysisGUI:
             ("Dimensione Minima del Set:", "min_size_entry", 10),
             ("Dimensione Massima del Set:", "max_size_entry", 10),
             ("Valore Massimo per un Elemento del Set:", "max_value_entry", 10),
-            ("Target come metà della somma del set? (True/False):", "is_partition_entry", 5)
+            ("Target come metà della somma del set? (True/False):", "is_partition_entry", 5),
+            ("Processi per la generazione (vuoto = esecuzione seriale):", "campaign_workers_entry", 5),
+            ("ε dell'FPTAS (vuoto = FPTAS non eseguito):", "epsilon_entry", 5)
         ]
 
         for text, attr, width in inputs:
@@ -110,8 +118,8 @@ class StatisticalAnalysisGUI:
             setattr(self, attr, entry)
 
         # Pulsante per generare le istanze
-        generate_input_button = tk.Button(self.input_frame, text="Genera", bg="#1A5276", fg="white", font=("Arial", 14, "bold"), command=self.generate_instances)
-        generate_input_button.pack(side=tk.TOP, anchor="w", padx=5, pady=10)
+        self.generate_input_button = tk.Button(self.input_frame, text="Genera", bg="#1A5276", fg="white", font=("Arial", 14, "bold"), command=self.generate_instances)
+        self.generate_input_button.pack(side=tk.TOP, anchor="w", padx=5, pady=10)
         self.input_frame.grid(row=4, column=0, columnspan=2, padx=10, pady=10, sticky="ew")
 
 
@@ -248,22 +256,55 @@ class StatisticalAnalysisGUI:
             return
         is_partition = is_partition_str == 'true'
 
-        generator = SubsetInstanceGenerator(num_instances, min_size, max_size, max_value, is_partition)
-        generator.run_subset_sum_algorithms()  # Esegui e salva i risultati nel DB
+        campaign_workers_str = self.campaign_workers_entry.get().strip()
+        try:
+            # Campo vuoto: le istanze vengono risolte una alla volta nel processo di lavoro
+            campaign_workers = int(campaign_workers_str) if campaign_workers_str else None
+            if campaign_workers is not None and campaign_workers < 1:
+                raise ValueError
+        except ValueError:
+            messagebox.showerror("Errore", "Inserisci un numero di processi positivo, oppure lascia il campo vuoto per l'esecuzione seriale.")
+            return
+
+        epsilon_str = self.epsilon_entry.get().strip()
+        try:
+            # Campo vuoto: l'algoritmo approssimato non viene eseguito
+            epsilon = float(epsilon_str) if epsilon_str else None
+            if epsilon is not None and not 0 < epsilon < 1:
+                raise ValueError
+        except ValueError:
+            messagebox.showerror("Errore", "Inserisci un valore di ε compreso tra 0 e 1 (esclusi), oppure lascia il campo vuoto.")
+            return
 
-        # Ottieni il conteggio di istanze e soluzioni salvate
-        dense_count = num_instances
-        sparse_count = num_instances
+        def campaign_done(saved_count):
+            # Ottieni il conteggio di istanze e soluzioni salvate
+            dense_count = num_instances
+            sparse_count = num_instances
 
-        # Mostra un messaggio con il conteggio dei risultati
-        self.statistic_text.delete(1.0, tk.END)
-        self.statistic_text.insert(tk.END, f"Istanze dense generate: {dense_count}\n")
-        self.statistic_text.insert(tk.END, f"Istanze sparse generate: {sparse_count}\n")
-        self.statistic_text.insert(tk.END, f"Soluzioni salvate nel DB: {6 * num_instances}\n")
+            # Mostra un messaggio con il conteggio dei risultati
+            self.statistic_text.delete(1.0, tk.END)
+            self.statistic_text.insert(tk.END, f"Istanze dense generate: {dense_count}\n")
+            self.statistic_text.insert(tk.END, f"Istanze sparse generate: {sparse_count}\n")
+            self.statistic_text.insert(tk.END, f"Soluzioni salvate nel DB: {saved_count}\n")
+
+        # Esegui in un processo separato e salva i risultati nel DB, senza bloccare la finestra
+        self.job_status.run(
+            "Generazione istanze",
+            run_generator,
+            args=(SubsetInstanceGenerator, (num_instances, min_size, max_size, max_value, is_partition)),
+            kwargs={'kwargs': {'campaign_workers': campaign_workers, 'epsilon': epsilon}},
+            on_done=campaign_done,
+            controls=[self.generate_input_button]
+        )
 
         print(f"Generando {num_instances} istanze con dimensione minima {min_size}, dimensione massima {max_size}, valore massimo {max_value}, e is_partition={is_partition}.")
 
         
+    def on_close(self):
+        """Annulla l'eventuale generazione in background e chiude la finestra."""
+        self.job_status.cancel()
+        self.master.destroy()
+
     def compare_algorithms(self):
         """Confronta le prestazioni degli algoritmi."""
         db_handler = DenseSparseDBHandler()  # Crea un'istanza della tua classe di gestione del DB
@@ -312,6 +353,13 @@ class StatisticalAnalysisGUI:
         for rank, (algo, avg) in enumerate(sorted_sparse, start=1):
             self.statistic_text.insert(tk.END, f"{rank}. {algo} con Tempo di esecuzione medio: {avg:.10f}\n")
 
+        # Visualizza il numero medio di soluzioni, solo per le istanze su cui è stato calcolato
+        avg_count_dense, avg_count_sparse = self.analyzer.calculate_avg_solution_count()
+        self.statistic_text.insert(tk.END, "\nNumero Medio di Soluzioni:\n")
+        for label, avg_count in (("Istanze Dense", avg_count_dense), ("Istanze Sparse", avg_count_sparse)):
+            text = f"{avg_count:.2f}" if avg_count is not None else "non disponibile"
+            self.statistic_text.insert(tk.END, f"{label}: {text}\n")
+
         # Inizializza la lista dei grafici
         self.graphs = [] 
 
@@ -1,12 +1,90 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
 from backend.subset_sum_calculator import SubsetSumSolver
+from backend.subset_sum_calculator_for_analysis import SubsetSumSolver as AnalysisSubsetSumSolver
+from backend.incremental_subset_sum_solver import IncrementalSubsetSumSolver
+from backend.result_cache import ResultCache
+from backend.solver_tracer import SolverTracer
 from backend.mongo_DB_handler import MongoDBHandler
 from backend.statistical_analysis import StatisticalAnalysis 
 from frontend.statistical_analysis_gui import StatisticalAnalysisGUI
 from backend.instance_generator import SubsetInstanceGeneratorWithS
+from frontend.dp_matrix_view import DPMatrixView
+from frontend.background_job_runner import JobStatusBar, run_generator
+
+def run_selected_algorithm(algorithm, S, T, trace_level, epsilon=None, progress=None):
+    """
+    Esegue nel processo di lavoro l'algoritmo selezionato nella GUI.
+
+    :param algorithm: Nome dell'algoritmo selezionato.
+    :param S: Set dell'istanza.
+    :param T: Target dell'istanza.
+    :param trace_level: Livello del SolverTracer per il solver didattico.
+    :param epsilon: Errore relativo ammesso dall'FPTAS (se None, quello predefinito).
+    :param progress: Funzione di avanzamento del BackgroundJobRunner (non usata: l'avanzamento di un singolo algoritmo
+                     non è noto, la GUI mostra il tempo trascorso).
+    :return: Soluzione, calcoli, numero di operazioni, tempo di esecuzione, matrice dp, il set e il target su cui è
+             calcolata la matrice, la garanzia 1 - ε (None per gli algoritmi esatti) e la distanza dal target.
+    """
+    if algorithm == "Portfolio":
+        # Gli algoritmi vengono eseguiti in parallelo su processi separati: vince la prima risposta
+        portfolio_solver = AnalysisSubsetSumSolver(S, T)
+        result, execution_time = portfolio_solver.calculate_portfolio()
+        return (result, [f"Algoritmo più veloce: {portfolio_solver.selected_algorithm}"], 0, execution_time, [], S, T,
+                None, portfolio_solver.gap)
+    if algorithm == "FPTAS":
+        # Soluzione approssimata: somma compresa tra (1 - ε)·OPT e T
+        approximate_solver = AnalysisSubsetSumSolver(S, T)
+        result, execution_time = approximate_solver.calculate_fptas(epsilon)
+        calculations = [f"Garanzia: somma >= {approximate_solver.approximation_ratio}·OPT",
+                        f"Distanza dal target: {approximate_solver.gap}"]
+        return (result, calculations, 0, execution_time, [], S, T, approximate_solver.approximation_ratio,
+                approximate_solver.gap)
+
+    # Senza riduzioni la matrice e i calcoli mostrati si riferiscono all'istanza inserita, anche nei casi banali
+    solver = SubsetSumSolver(S, T, reduce=False, tracer=SolverTracer(level=trace_level))
+    methods = {
+        "Dynamic Programming": solver.calculate_dynamic_programming,
+        "Meet-in-the-Middle": solver.calculate_meet_in_the_middle,
+        "Backtracking": solver.calculate_backtracking,
+    }
+    if algorithm not in methods:
+        raise ValueError(f"Algoritmo sconosciuto: {algorithm}")
+    result, calculations, operations, execution_time, matrix = methods[algorithm]()
+    gap = T - sum(result) if result else None
+    return result, calculations, operations, execution_time, matrix, solver.S, solver.T, None, gap
+
+def run_incremental_solver(incremental_solver, S, T, progress=None):
+    """
+    Aggiorna nel processo di lavoro il solver incrementale della GUI e risolve il target. Il solver viene ricostruito
+    alla prima risoluzione o se T supera il target massimo per cui è stato creato, altrimenti si aggiornano solo gli
+    elementi modificati rispetto alla risoluzione precedente.
+
+    :param incremental_solver: Solver incrementale della risoluzione precedente (None alla prima).
+    :param S: Set dell'istanza.
+    :param T: Target dell'istanza.
+    :param progress: Funzione di avanzamento del BackgroundJobRunner (non usata).
+    :return: Solver aggiornato, da conservare nella GUI per la risoluzione successiva, e la tupla del risultato nel
+             formato di run_selected_algorithm.
+    """
+    if incremental_solver is None or T > incremental_solver.max_target:
+        incremental_solver = IncrementalSubsetSumSolver(S, max_target=T)
+        inserted, removed = list(S), []
+    else:
+        inserted, removed = incremental_solver.update(S)
+    result, execution_time = incremental_solver.solve(T)
+    calculations = [f"Elementi inseriti: {inserted}",
+                    f"Elementi rimossi: {removed}",
+                    f"Aggiornamento: {incremental_solver.last_update_time:.6f} secondi",
+                    f"Sottoinsiemi con somma T (mod {IncrementalSubsetSumSolver.PRIME}): {incremental_solver.count(T)}"]
+    gap = T - sum(result) if result else None
+    outcome = (result, calculations, len(inserted) + len(removed), execution_time, [], S, T, None, gap)
+    return incremental_solver, outcome
 
 class SubsetSumGUI:
+    # Righe dei calcoli mostrate contemporaneamente: solo queste vengono convertite in testo
+    CALCULATION_ROWS = 16
+
     def __init__(self, master):
         self.master = master
         master.title("Subset Sum Solver")
@@ -38,6 +116,11 @@ class SubsetSumGUI:
         self.generate_button = tk.Button(self.input_frame, text="Genera", command=self.generate_instances_from_input, bg="#1A5276", fg="white", font=("Arial", 14, "bold") )
         self.generate_button.pack(side=tk.LEFT, padx=10)
 
+        # Stato delle operazioni eseguite in background, con il pulsante per annullarle
+        self.job_status = JobStatusBar(self.frame)
+        self.job_status.grid(row=9, columnspan=2, pady=5)
+        master.protocol("WM_DELETE_WINDOW", self.on_close)
+
 
         self.label_set = tk.Label(self.frame, text="Inserisci l'insieme di numeri (separati da virgola):", bg="#f0f0f5", font=("Arial", 14))
         self.label_set.grid(row=0, column=0, sticky="w")
@@ -54,7 +137,7 @@ class SubsetSumGUI:
         self.label_algorithm = tk.Label(self.frame, text="Seleziona l'algoritmo:", bg="#f0f0f5", font=("Arial", 14))
         self.label_algorithm.grid(row=2, column=0, sticky="w")
 
-        self.algorithm_options = ["Dynamic Programming", "Meet-in-the-Middle", "Backtracking"]
+        self.algorithm_options = ["Dynamic Programming", "Meet-in-the-Middle", "Backtracking", "Portfolio", "FPTAS", "Incrementale"]
         self.selected_algorithm = tk.StringVar(value=self.algorithm_options[0])
         self.menu = ttk.Combobox(self.frame, textvariable=self.selected_algorithm, values=self.algorithm_options, font=("Arial", 14))
         self.menu.grid(row=2, column=1, padx=5, pady=5)
@@ -73,10 +156,24 @@ class SubsetSumGUI:
         self.button_delete_all.pack(side=tk.LEFT, padx=10)
         
         self.db_handler = MongoDBHandler()
+        # Solver incrementale mantenuto tra una risoluzione e l'altra
+        self.incremental_solver = None
+        self.result_cache = ResultCache()
         self.statistical_analysis = StatisticalAnalysis(self.db_handler)  
         
         self.button_statistical_analysis = tk.Button(self.button_frame, text="Analisi Statistiche", command=self.open_statistical_analysis, bg="#1A5276", fg="white", font=("Arial", 14, "bold"))
         self.button_statistical_analysis.pack(side=tk.LEFT, padx=10)
+
+        tk.Label(self.button_frame, text="Tracciamento:", bg="#f0f0f5", font=("Arial", 14)).pack(side=tk.LEFT, padx=5)
+        self.trace_levels = {name: level for level, name in SolverTracer.LEVEL_NAMES.items()}
+        self.selected_trace_level = tk.StringVar(value=SolverTracer.LEVEL_NAMES[SolverTracer.FULL])
+        self.trace_menu = ttk.Combobox(self.button_frame, textvariable=self.selected_trace_level, values=list(self.trace_levels), font=("Arial", 14), width=12, state="readonly")
+        self.trace_menu.pack(side=tk.LEFT, padx=5)
+
+        tk.Label(self.button_frame, text="ε FPTAS:", bg="#f0f0f5", font=("Arial", 14)).pack(side=tk.LEFT, padx=5)
+        self.epsilon_entry = tk.Entry(self.button_frame, font=("Arial", 14), width=6)
+        self.epsilon_entry.insert(0, str(AnalysisSubsetSumSolver.DEFAULT_EPSILON))
+        self.epsilon_entry.pack(side=tk.LEFT, padx=5)
         
         self.output_frame = tk.Frame(self.frame, bg="#f0f0f5")
         self.output_frame.grid(row=6, columnspan=2, pady=10)
@@ -86,6 +183,12 @@ class SubsetSumGUI:
 
         self.calculation_box = tk.Text(self.output_frame, width=40, height=17, font=("Arial", 12), bg="#e7f1ff")
         self.calculation_box.pack(side=tk.LEFT, padx=5)
+        self.calculation_box.bind("<MouseWheel>", lambda event: self.scroll_calculations("scroll", -1 if event.delta > 0 else 1, "units"))
+
+        self.calculation_scrollbar = tk.Scrollbar(self.output_frame, orient=tk.VERTICAL, command=self.scroll_calculations)
+        self.calculation_scrollbar.pack(side=tk.LEFT, fill=tk.Y)
+        self.calculations = []
+        self.calculation_offset = 0
 
         self.separator = ttk.Separator(self.output_frame, orient="vertical")
         self.separator.pack(side=tk.LEFT, padx=10, fill=tk.Y)
@@ -99,6 +202,10 @@ class SubsetSumGUI:
         self.matrix_frame = tk.Frame(self.solution_frame, bg="#f0f0f5")
         self.matrix_frame.pack(padx=5)
 
+        # Vista virtualizzata: disegna solo le celle visibili della matrice dp
+        self.matrix_view = DPMatrixView(self.matrix_frame)
+        self.matrix_view.pack(fill=tk.BOTH, expand=True)
+
         self.update_statistical_analysis_button()
 
     def update_statistical_analysis_button(self):
@@ -117,17 +224,81 @@ class SubsetSumGUI:
             messagebox.showerror("Errore di input", "Assicurati di inserire numeri validi.")
             return
 
-        solver = SubsetSumSolver(S, T)
-     
-        if self.selected_algorithm.get() == "Dynamic Programming":
-            result, calculations, operations, execution_time, matrix = solver.calculate_dynamic_programming()
-        elif self.selected_algorithm.get() == "Meet-in-the-Middle":
-            result, calculations, operations, execution_time, matrix = solver.calculate_meet_in_the_middle()
-        elif self.selected_algorithm.get() == "Backtracking":
-            result, calculations, operations, execution_time, matrix = solver.calculate_backtracking()
-
-        
-        optimal_solution_message = f"Algoritmo: {self.selected_algorithm.get()}\n" \
+        algorithm = self.selected_algorithm.get()
+        epsilon = None
+        if algorithm == "FPTAS":
+            try:
+                epsilon = float(self.epsilon_entry.get())
+                if not 0 < epsilon < 1:
+                    raise ValueError
+            except ValueError:
+                messagebox.showerror("Errore di input", "Inserisci un valore di ε compreso tra 0 e 1 (esclusi).")
+                return
+
+        # Con il grafico disabilitato non servono i passaggi intermedi: le istanze già risolte vengono lette dalla cache
+        use_cache = self.disable_graph_var.get() and algorithm != "Incrementale"
+        cache_key = self.get_cache_key(algorithm, epsilon)
+        cached = self.result_cache.get(S, T, *cache_key) if use_cache else None
+
+        if cached is not None:
+            outcome = (cached['solution'], ["Risultato recuperato dalla cache"], 0, cached['execution_time'], [], S, T,
+                       cached['approximation_ratio'], cached['gap'])
+            self.show_result(algorithm, S, T, outcome, use_cache, from_cache=True, cache_key=cache_key)
+        elif algorithm == "Incrementale":
+            # La costruzione del solver può richiedere secondi: viene eseguita in background e il solver aggiornato
+            # torna alla GUI, che lo conserva per aggiornare solo gli elementi modificati alla risoluzione successiva
+            def incremental_done(returned):
+                self.incremental_solver, outcome = returned
+                self.show_result(algorithm, S, T, outcome, use_cache, from_cache=False, cache_key=cache_key)
+
+            self.job_status.run(
+                f"Esecuzione {algorithm}",
+                run_incremental_solver,
+                args=(self.incremental_solver, S, T),
+                on_done=incremental_done,
+                controls=[self.button_solve, self.generate_button]
+            )
+        else:
+            # Gli altri algoritmi vengono eseguiti in un processo separato, per non bloccare la finestra
+            trace_level = self.trace_levels[self.selected_trace_level.get()]
+            self.job_status.run(
+                f"Esecuzione {algorithm}",
+                run_selected_algorithm,
+                args=(algorithm, S, T, trace_level, epsilon),
+                on_done=lambda outcome: self.show_result(algorithm, S, T, outcome, use_cache, from_cache=False,
+                                                         cache_key=cache_key),
+                controls=[self.button_solve, self.generate_button]
+            )
+
+    @staticmethod
+    def get_cache_key(algorithm, epsilon=None):
+        """
+        Restituisce il nome e il tipo di solver con cui un risultato viene salvato nella cache: per l'FPTAS il nome include ε,
+        da cui dipende il risultato, e Portfolio e FPTAS sono eseguiti dal solver di analisi, gli altri da quello didattico.
+
+        :param algorithm: Algoritmo selezionato.
+        :param epsilon: Errore relativo ammesso dall'FPTAS (None per gli altri algoritmi).
+        :return: Coppia (nome dell'algoritmo, tipo di solver) nella cache.
+        """
+        name = f"{algorithm} ε={epsilon}" if epsilon is not None else algorithm
+        kind = ResultCache.ANALYSIS if algorithm in ("Portfolio", "FPTAS") else ResultCache.EDUCATIONAL
+        return name, kind
+
+    def show_result(self, algorithm, S, T, outcome, use_cache, from_cache, cache_key=None):
+        """
+        Mostra il risultato di una risoluzione, lo salva nella cache e nel database e disegna la matrice dp.
+
+        :param algorithm: Algoritmo selezionato.
+        :param S: Set dell'istanza.
+        :param T: Target dell'istanza.
+        :param outcome: Tupla restituita da run_selected_algorithm.
+        :param use_cache: Se True il risultato viene salvato nella cache.
+        :param from_cache: True se il risultato è stato letto dalla cache.
+        :param cache_key: Nome dell'algoritmo e tipo di solver nella cache, come restituiti da get_cache_key.
+        """
+        result, calculations, operations, execution_time, matrix, matrix_S, matrix_T, approximation_ratio, gap = outcome
+
+        optimal_solution_message = f"Algoritmo: {algorithm}\n" \
                                     f"Insieme S: {S}\n" \
                                     f"Somma Target T: {T}\n" \
                                     f"Soluzione Ottimale: {result if result else 'Nessuna soluzione'}\n" \
@@ -135,53 +306,91 @@ class SubsetSumGUI:
 
         messagebox.showinfo("Risultato Ottimale", optimal_solution_message)
 
+        if use_cache:
+            if not from_cache:
+                name, kind = cache_key
+                self.result_cache.put(S, T, name, {
+                    'solution': result,
+                    'execution_time': execution_time,
+                    'is_partial': False,
+                    'gap': gap,
+                    'approximation_ratio': approximation_ratio,
+                }, kind)
+            cache_stats = self.result_cache.stats()
+
         self.output_text.delete(1.0, tk.END)
         self.output_text.insert(tk.END, f"Tempo di esecuzione: {execution_time:.10f} secondi\n")
         self.output_text.insert(tk.END, f"Operazioni: {operations}\n")
+        if use_cache:
+            self.output_text.insert(tk.END, f"Cache: {cache_stats['hits']} hit, {cache_stats['misses']} miss\n")
 
-        self.calculation_box.delete(1.0, tk.END)
-        self.calculation_box.insert(tk.END, "Calcoli:\n" + "\n".join(calculations) + "\n")
+        self.show_calculations(calculations)
 
-        self.db_handler.save_instance(S, T, execution_time, result, self.selected_algorithm.get())
+        if not from_cache:
+            # Un risultato letto dalla cache non è una nuova misurazione
+            self.db_handler.save_instance(S, T, execution_time, result, algorithm, gap=gap,
+                                          approximation_ratio=approximation_ratio)
         
         self.update_statistical_analysis_button()  # Verifica e aggiorna lo stato del pulsante
 
-        if not self.disable_graph_var.get():
-            self.display_matrix(matrix, S, T)
+        if not self.disable_graph_var.get() and matrix:
+            self.display_matrix(matrix, matrix_S, matrix_T)
+        else:
+            # La matrice della risoluzione precedente non corrisponde a questo risultato
+            self.matrix_view.clear()
+
+    def show_calculations(self, calculations):
+        """
+        Mostra i calcoli di un'esecuzione a partire dalla prima riga.
+
+        :param calculations: Sequenza di righe (lista di stringhe o SolverTracer, che produce il testo solo alla lettura).
+        """
+        self.calculations = calculations
+        self.calculation_offset = 0
+        self.render_calculations()
+
+    def render_calculations(self):
+        """Scrive nel riquadro dei calcoli solo le righe visibili e aggiorna la barra di scorrimento."""
+        total = len(self.calculations)
+        rows = self.calculations[self.calculation_offset:self.calculation_offset + self.CALCULATION_ROWS]
+        self.calculation_box.delete(1.0, tk.END)
+        self.calculation_box.insert(tk.END, f"Calcoli ({total} righe):\n" + "\n".join(rows) + "\n")
+        if total:
+            self.calculation_scrollbar.set(self.calculation_offset / total, min(1.0, (self.calculation_offset + self.CALCULATION_ROWS) / total))
+        else:
+            self.calculation_scrollbar.set(0.0, 1.0)
+
+    def scroll_calculations(self, action, amount, unit=None):
+        """
+        Gestisce lo scorrimento del riquadro dei calcoli, secondo il protocollo dei comandi di tk.Scrollbar.
+
+        :param action: "moveto" (posizione frazionaria) oppure "scroll" (spostamento relativo).
+        :param amount: Frazione per "moveto", numero di unità o pagine per "scroll".
+        :param unit: "units" o "pages" per "scroll".
+        """
+        total = len(self.calculations)
+        if action == "moveto":
+            offset = int(float(amount) * total)
+        else:
+            step = self.CALCULATION_ROWS if unit == "pages" else 1
+            offset = self.calculation_offset + int(amount) * step
+        self.calculation_offset = max(0, min(offset, total - self.CALCULATION_ROWS))
+        self.render_calculations()
 
     def open_statistical_analysis(self):
         new_window = tk.Toplevel(self.master)
         StatisticalAnalysisGUI(new_window, self.statistical_analysis, self.db_handler) 
 
     def display_matrix(self, dp, S, T):
-        # Rimuovi i widget esistenti nella matrice
-        for widget in self.matrix_frame.winfo_children():
-            widget.destroy()
-
-        # Intestazione per S e T
-        header_label_S = tk.Label(self.matrix_frame, text="S \\ T", borderwidth=2, relief="solid", bg="#007bff", fg="white", font=("Arial", 12, "bold"), width=4)
-        header_label_S.grid(row=0, column=0, padx=2, pady=2)
-
-        # Intestazione per la somma target T
-        for j in range(T + 1):
-            header_label = tk.Label(self.matrix_frame, text=str(j), borderwidth=2, relief="solid", bg="#007bff", fg="white", font=("Arial", 12, "bold"), width=4)
-            header_label.grid(row=0, column=j + 1, padx=2, pady=2)
-
-        # Popolamento della matrice
-        for i in range(1, len(S) + 1):
-            header_label = tk.Label(self.matrix_frame, text=str(S[i - 1]), borderwidth=2, relief="solid", bg="#007bff", fg="white", font=("Arial", 12, "bold"), width=4)
-            header_label.grid(row=i, column=0, padx=2, pady=2)
-
-            for j in range(T + 1):
-                value = dp[i][j]
-                # Colorazione delle celle in base al valore
-                if  value == 1:  
-                    value_label = tk.Label(self.matrix_frame, text=str(value), borderwidth=2, relief="solid", bg="lightgreen", width=4, font=("Arial", 12))
-                else:
-                    value_label = tk.Label(self.matrix_frame, text=str(value), borderwidth=2, relief="solid", bg="salmon", width=4, font=("Arial", 12))
-
-                value_label.grid(row=i, column=j + 1, padx=2, pady=2)
-
+        """
+        Mostra la matrice dp nella vista virtualizzata, evidenziando il percorso di ricostruzione della soluzione.
+
+        :param dp: Matrice dp restituita dalla Programmazione Dinamica.
+        :param S: Elementi del set corrispondenti alle righe della matrice.
+        :param T: Target, ultima colonna della matrice.
+        """
+        path = SubsetSumSolver.find_solution_path(dp, S, T)
+        self.matrix_view.show(dp, S, T, path)
         self.matrix_frame.config(borderwidth=2, relief="groove")
 
     def delete_all_entries(self):
@@ -197,11 +406,26 @@ class SubsetSumGUI:
             num_instances = int(self.num_instances_entry.get())
             target = int(self.target_entry.get())
             s = int(self.insieme_entry.get())
-            
-            generator = SubsetInstanceGeneratorWithS(num_instances, target, s)
-            generator.run_subset_sum_algorithms()
-            self.output_text.delete(1.0, tk.END)
-            self.output_text.insert(tk.END, f"Successo {3* num_instances} soluzioni salvate nel database.\n")
-        
         except ValueError:
             messagebox.showerror("Errore di input", "Assicurati di inserire valori numerici validi.")
+            return
+
+        def campaign_done(saved_count):
+            self.output_text.delete(1.0, tk.END)
+            self.output_text.insert(tk.END, f"Successo {saved_count} soluzioni salvate nel database.\n")
+            self.update_statistical_analysis_button()
+
+        # La campagna viene eseguita in un processo separato, che salva i risultati nel database man mano
+        self.job_status.run(
+            "Generazione istanze",
+            run_generator,
+            args=(SubsetInstanceGeneratorWithS, (num_instances, target, s)),
+            kwargs={'use_result_cache': True},
+            on_done=campaign_done,
+            controls=[self.button_solve, self.generate_button]
+        )
+
+    def on_close(self):
+        """Annulla l'eventuale operazione in background e chiude la finestra."""
+        self.job_status.cancel()
+        self.master.destroy()